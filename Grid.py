@@ -1,18 +1,32 @@
-from util.Tile import Tile
+from util.Board import Board, TILE, WALL, SEEN, PATH, ORIGIN, TARGET, MAX_WEIGHT
 from util.Button import Button
+from util.Slider import Slider
 from util.Maze import Maze
+from util.Trace import Trace, Replay
+from util.Race import Race, Pane
+from util.Metrics import Metrics
+from util.Camera import Camera
+from util.MapFile import saveBinary, BinaryMap
+from util.SolutionCache import SolutionCache
+from util.DistanceField import DistanceField
 
-from algorithms.BFS import BFS
-from algorithms.DFS import DFS
-from algorithms.GFS import GFS
-from algorithms.AStar import AStar
+from algorithms import Registry
 
-from math import floor
+from solve import solve, solveTraced, Solution, RACE
+
+from concurrent.futures import ProcessPoolExecutor, Future
+from math import floor, log
+import warnings
 import pygame
+import random
+import time
 
 class Grid:
     def __init__(self, width, height, tile_w, colorPalette, 
-                 line_w = 1, menuOffset = 0, txtSize = 42, nSolutions = 4, fpsFast = 45, fpsSlow = 10):
+                 line_w = 1, menuOffset = 0, txtSize = 42, nSolutions = 4, fps = 60, 
+                 minSpeed = 2, maxSpeed = 200000, speed = 10, traceFile = "trace.gtt",
+                 metrics = False, metricsFile = "metrics", boardSize = None, mapFile = "map.gtm",
+                 preview = False):
         self.WIDTH = width
         self.HEIGHT = height
         self.colorPalette = colorPalette
@@ -20,56 +34,116 @@ class Grid:
         self.LINE_W = line_w
         
         self.nSolutions = nSolutions
-        self.fpsFast = fpsFast
-        self.fpsSlow = fpsSlow
+        
+        # the ui always runs at the same fps, the speed is how many steps of the search are run each second
+        #   - speed goes from minSpeed to maxSpeed steps per second, None means instant
+        #   - stepCredit accumulates the steps owed so speeds lower than the fps still work
+        #   - no matter the speed, the steps of a frame stop once they take longer than frameBudget seconds
+        self.FPS = fps
+        self.minSpeed = minSpeed
+        self.maxSpeed = maxSpeed
+        self.speed = speed
+        self.stepCredit = 0
+        self.frameBudget = 0.6 / self.FPS
 
-        self.TILE_W = tile_w # should be divisible by width and height so it all works out
+        self.TILE_W = tile_w # size of the tiles before zooming
         self.RECT_OFF = floor(self.LINE_W / 2) # offset due to the line's width
         
-        # array of tiles
-        self.tiles = []
-        for h in range(0, self.HEIGHT, self.TILE_W):
-            row = []
-            for w in range(0, self.WIDTH, self.TILE_W):
-                # menu offset is included in the height
-                row.append(Tile(w, h + self.Y_OFFSET, self.TILE_W, self.RECT_OFF))
-            self.tiles.append(row)
+        # tiles smaller than LINE_SCALE pixels are drawn without the grid lines
+        # and when more than DIRTY_LIMIT tiles change in a frame the whole board is drawn again, it is faster than tile by tile
+        self.LINE_SCALE = 6
+        self.DIRTY_LIMIT = 2000
+        
+        # boards of up to PREVIEW_SOLVE_LIMIT tiles are solved with A* while the preview waits for its distance field
+        self.PREVIEW_SOLVE_LIMIT = 40000
+        
+        # state of every tile, see util/Board
+        #   - boardSize is (columns, rows), by default the board is as big as the window with tiles of tile_w
+        if boardSize == None:
+            boardSize = (self.WIDTH // self.TILE_W, self.HEIGHT // self.TILE_W)
+        
+        self.board = Board(*boardSize)
+        
+        # part of the board shown in the window, it can be moved with the middle mouse button (or shift and left click),
+        # zoomed with the mouse wheel, and F fits the whole board in the window (see util/Camera)
+        self.camera = Camera(0, self.Y_OFFSET, self.WIDTH, self.HEIGHT, self.board.width, self.board.height, self.TILE_W)
+        self.panning = None # mouse position the last time the camera was moved
+        
+        # color of each state, indexed by the state
+        self.colors = [
+            self.colorPalette["GRAY"],     # tile
+            self.colorPalette["DARKBLUE"], # wall
+            self.colorPalette["BLUE"],     # seen
+            self.colorPalette["MINT"],     # path
+            self.colorPalette["ORANGE"],   # current
+            self.colorPalette["GREEN"],    # origin
+            self.colorPalette["RED"],      # target
+        ]
+        
+        # the board is drawn with a color per state and weight (state | weight << 3, see Board.shaded)
+        #   -> tiles, seen tiles and the path get darker towards the terrain color the more they weigh
+        self.shades = []
+        for i in range(256):
+            state, weight = i & 7, i >> 3
+            color = self.colors[state] if state < len(self.colors) else self.colorPalette["GRAY"]
+            
+            if weight and state in (TILE, SEEN, PATH):
+                t = weight / (weight + 3)
+                color = tuple(round(a + (b - a) * t) for a, b in zip(color, self.colorPalette["BROWN"]))
+            
+            self.shades.append(color)
+        
+        # with a terrain brush (keys 1 to 9) left click paints tiles that cost that much to move onto instead of walls,
+        # 0 goes back to walls
+        self.terrain = None
                 
         # array of buttons
         pygame.font.init()
         bigFont = pygame.font.SysFont('Calibri', txtSize)
         
-        self.algButtons = [
-            Button(110, 50, "Depth FS", bigFont, self.colorPalette),
-            Button(315, 50, "Breadth FS", bigFont, self.colorPalette),
-            Button(530, 50, "Greedy FS", bigFont, self.colorPalette),
-            Button(740, 50, "A-Star", bigFont, self.colorPalette)
-        ]
+        # one button per algorithm of the registry that can be used (the numpy engine only when numpy is installed)
+        #   -> their modules are only imported when they are first run, see algorithms/Registry
+        self.algorithmsByLabel = {algorithm.label : algorithm for algorithm in Registry.algorithms()}
+        algorithms = list(self.algorithmsByLabel)
+        
+        # when they don't fit in one row they go in two rows with a smaller font
+        self.algButtons = self.layoutButtons(algorithms, bigFont, 20, 120)
+        if self.algButtons[-1].y != self.algButtons[0].y:
+            self.algButtons = self.layoutButtons(algorithms, pygame.font.SysFont('Calibri', floor(txtSize * 3 / 4)), 0, 130)
         
         smallFont = pygame.font.SysFont('Calibri', floor(txtSize / 2))
+        self.smallFont = smallFont
         
         self.otherButtons = {
             "Maze" : Button(110, 150, "Generate Maze", smallFont, self.colorPalette),
             "Clear" : Button(280, 150, "Clear", smallFont, self.colorPalette),
-            "Slow"  : Button(725, 150, "Slow", smallFont, self.colorPalette),
-            "Fast" : Button(800, 150, "Fast", smallFont, self.colorPalette)
+            "Replay" : Button(380, 150, "Replay", smallFont, self.colorPalette),
+            "Race" : Button(480, 150, "Race", smallFont, self.colorPalette),
         }
         
-        self.otherButtons["Slow"].highlightTrue()
-        self.FPS = self.fpsSlow
+        # speed slider goes from minSpeed (left) to instant (right) on a logarithmic scale
+        self.speedSlider = Slider(700, 150, 220, "", smallFont, self.colorPalette)
+        self.speedSlider.value = log(self.speed / self.minSpeed) / log(self.maxSpeed / self.minSpeed)
+        self.updateSpeed()
+        self.sliderDragged = False
         
         
         
-        # origin and target tile -> for dragging them
-        self.originTile = self.tiles[0][0]
-        self.originTile.updateState("origin")
+        # origin and target tile (x, y) -> for dragging them
+        self.origin = (0, 0)
+        self.board.set(*self.origin, ORIGIN)
         
-        self.targetTile = self.tiles[-1][-1]
-        self.targetTile.updateState("target")
+        self.target = (self.board.width - 1, self.board.height - 1)
+        self.board.set(*self.target, TARGET)
         
         # maze generator
         self.mazeGen = None
         
+        # the map can be saved to mapFile with ctrl + S and loaded back with ctrl + L (see util/MapFile)
+        #   - seed is the seed of the maze the map was generated from, None if it was drawn
+        self.mapFile = mapFile
+        self.seed = None
+        
         # for mouse dragging
         self.leftBeingClicked = False
         self.rightBeingClicked = False
@@ -83,103 +157,591 @@ class Grid:
         # algorithm is the algorithm object in itself
         self.algorithm = None
         
+        # in replay mode the algorithm is solved up front and then its trace is played (see util/Trace)
+        #   - replay is the trace being played, it can be moved with the arrow keys and saved to / loaded from traceFile
+        self.replayMode = False
+        self.replay = None
+        self.traceFile = traceFile
+        
+        # every finished search is kept with its trace, so solving the same map again only plays it back
+        #   - live searches are recorded as they run, the recording is the trace being built
+        self.solutions = SolutionCache()
+        self.solutionKey = None # key of the search being run, see defineAlgorithm
+        self.recording = None
+        self.searchSeconds = 0
+        
+        # with preview on (P) dragging the origin or the target shows the shortest path between them on every frame
+        #   - field has the distance of every tile to the endpoint that is not dragged, so the path is walked back
+        #     from the dragged one without searching (see util/DistanceField), it is kept while the map doesn't change
+        #   - previewPath is the path drawn the last frame
+        self.preview = preview
+        self.field = None
+        self.fieldKey = None
+        self.previewPath = []
+        
+        # LPA* (and any incremental algorithm) is kept between runs, so after editing some walls it only repairs its last
+        # search (see replan), plannerName is the algorithm it belongs to
+        self.planner = None
+        self.plannerName = None
+        
+        # in race mode these algorithms solve the map at the same time in a pool of processes (see util/Race)
+        #   -> label of their button and their name in solve.py
+        self.raceMode = False
+        self.race = None
+        self.raceAlgorithms = [(Registry.find(name).label, name) for name in RACE]
+        self.pool = None # only started the first time there is a race
+        self.summary = None # table with the results of the race once it is over
+        
+        
+        # counters and timings shown at the bottom of the menu (see util/Metrics), turned on and off with M
+        #   - D saves them to metricsFile as .json and .csv
+        self.metrics = Metrics(self.FPS) if metrics else None
+        self.metricsFile = metricsFile
+        self.metricsFont = pygame.font.SysFont('Calibri', floor(txtSize * 0.4))
+        self.metricsText = None
+        self.metricsShown = 0 # when the text was last rendered, it only changes a few times per second so it can be read
+        self.measured = None # algorithm whose steps are being counted
+        self.frameSteps = 0
         
         self.solved = False
         
+        # for drawing only what changed
+        #   - background is the grid lines and the menu, it is only rendered again when a button changes
+        #   - the tiles that changed since the last frame are tracked by the board
+        self.background = None
+        
     def draw(self, screen):
-        self.drawGrid(screen)
-        self.drawTiles(screen)
-        self.drawButtons(screen)
+        if self.race != None:
+            self.drawButtons(screen)
+            self.drawRace(screen, True)
+            
+        else:
+            self.drawBoard(screen)
+            self.drawButtons(screen)
+        
+        self.drawMetrics(screen, True)
+        self.board.takeDirty()
+        
+    def drawChanges(self, screen):
+        # draws only the tiles that changed since the last frame over the cached background
+        # returns the list of rects that have to be updated on the display
+        if self.background == None:
+            self.background = pygame.Surface(screen.get_size()).convert()
+            self.background.fill(self.colorPalette["GRAY"])
+            self.drawButtons(self.background)
+            
+            self.board.allDirty = True
+        
+        dirty = self.board.takeDirty()
+        
+        # the whole board changed
+        if dirty == None:
+            screen.blit(self.background, (0, 0))
+            
+            if self.race != None:
+                self.drawRace(screen, True)
+            else:
+                self.drawBoard(screen)
+            
+            self.drawMetrics(screen, True)
+            return [screen.get_rect()]
+        
+        if self.race != None:
+            return self.drawRace(screen, False) + self.drawMetrics(screen)
+        
+        if not dirty:
+            return self.drawMetrics(screen)
+        
+        # small tiles or too many of them -> the board is drawn again
+        if self.camera.scale < self.LINE_SCALE or len(dirty) > self.DIRTY_LIMIT:
+            return [self.drawBoard(screen)] + self.drawMetrics(screen)
+        
+        # tiles at the edge of the viewport are only partly drawn
+        viewport = pygame.Rect(self.camera.left, self.camera.top, self.camera.width, self.camera.height)
+        screen.set_clip(viewport)
+        
+        rects = []
+        for i in dirty:
+            x, y = self.board.toTile(i)
+            
+            # tiles outside the viewport are drawn once they are scrolled into it
+            if not self.isVisible(x, y):
+                continue
+            
+            rect = self.tileRect(x, y)
+            pygame.draw.rect(screen, self.shades[self.board.states[i] | self.board.weights[i] << 3], rect)
+            rects.append(rect.clip(viewport))
+        
+        screen.set_clip(None)
+        return rects + self.drawMetrics(screen)
         
     def update(self, state):
+        # the speed can be changed in any state
+        if self.sliderDragged:
+            self.speedSlider.moveTo(pygame.mouse.get_pos()[0])
+            self.updateSpeed()
+        
+        # and the camera can be moved in any state
+        if self.panning != None:
+            (x, y) = pygame.mouse.get_pos()
+            
+            if (x, y) != self.panning:
+                self.camera.pan(x - self.panning[0], y - self.panning[1])
+                self.panning = (x, y)
+                self.board.allDirty = True
+        
         # DRAW STATE
         if state == "draw":
             (x, y) = pygame.mouse.get_pos()
             (xGrid, yGrid) = self.pixelsToGrid(x, y)
             
-            if y > self.Y_OFFSET:
-                clickedTile = self.tiles[yGrid][xGrid]
+            if y > self.Y_OFFSET and self.camera.inside(xGrid, yGrid):
+                clickedTile = (xGrid, yGrid)
                 
-                if self.leftBeingClicked and clickedTile != self.originTile and clickedTile != self.targetTile:
-                    clickedTile.updateState("wall")
+                # with the preview on the origin and the target don't erase the walls they are dragged over,
+                # so the map (and the distance field of the preview) stays the same while dragging
+                blocked = self.preview and self.board.get(xGrid, yGrid) == WALL
+                
+                if self.leftBeingClicked and clickedTile != self.origin and clickedTile != self.target:
+                    if self.terrain == None:
+                        self.board.set(xGrid, yGrid, WALL)
+                    else:
+                        if self.board.get(xGrid, yGrid) == WALL:
+                            self.board.set(xGrid, yGrid, TILE)
+                        
+                        self.board.setWeight(xGrid, yGrid, min(self.terrain - 1, MAX_WEIGHT))
                     
-                elif self.rightBeingClicked and clickedTile != self.originTile and clickedTile != self.targetTile:
-                    clickedTile.updateState("tile")
+                elif self.rightBeingClicked and clickedTile != self.origin and clickedTile != self.target:
+                    self.board.set(xGrid, yGrid, TILE)
+                    self.board.setWeight(xGrid, yGrid, 0)
                     
-                elif self.originDragged and clickedTile != self.targetTile: 
-                    self.originTile.updateState("tile")
-                    self.originTile = clickedTile
-                    self.originTile.updateState("origin")
+                elif self.originDragged and clickedTile != self.target and not blocked: 
+                    self.board.set(*self.origin, TILE)
+                    self.origin = clickedTile
+                    self.board.set(*self.origin, ORIGIN)
                     
-                elif self.targetDragged and clickedTile != self.originTile:
-                    self.targetTile.updateState("tile")
-                    self.targetTile = clickedTile
-                    self.targetTile.updateState("target")
+                elif self.targetDragged and clickedTile != self.origin and not blocked:
+                    self.board.set(*self.target, TILE)
+                    self.target = clickedTile
+                    self.board.set(*self.target, TARGET)
+            
+            if self.preview and (self.originDragged or self.targetDragged):
+                self.updatePreview()
         
         # SOLVE STATE
         elif state == "solve":
-            if self.algorithm.stepSearch() == 1:
-                self.solved = True
+            if self.race != None:
+                # waits for every algorithm to be solved, and then plays them all at the same time
+                if self.race.ready():
+                    if self.race.position == 0:
+                        for pane in self.race.panes:
+                            self.solutions.put(pane.key, pane.solution, pane.replay.trace)
+                    
+                    self.race.seek(self.race.position + self.stepsThisFrame())
+                    
+                    if self.race.finished():
+                        self.solved = True
+                
+            elif self.replay != None:
+                # the search is already solved, just move forward in its trace
+                self.applyChanges(*self.replay.seek(self.replay.position + self.stepsThisFrame()))
+                
+                if self.replay.finished():
+                    self.solved = True
+                
+            elif self.algorithm != None:
+                seen = self.runSteps()
+                
+                # only update the tiles that changed since the last frame
+                #   -> the tiles seen in each step were already taken by the recording
+                (newSeen, previous, current, removed, added) = self.algorithm.getChanges()
+                self.applyChanges(seen + newSeen, previous, current, removed, added)
+    
+    def updatePreview(self):
+        # draws the path between the origin and the target, from the one being dragged to the other one
+        if self.originDragged:
+            (source, moving) = (self.target, self.origin)
+        else:
+            (source, moving) = (self.origin, self.target)
+        
+        key = (self.board.mapKey(), source)
+        if key != self.fieldKey:
+            self.field = DistanceField(self.board.getWalls(), self.board.width, self.board.height, source)
+            self.fieldKey = key
+        
+        if not self.field.done():
+            self.field.grow(time.perf_counter() + self.frameBudget)
+        
+        path = self.field.pathFrom(moving)
+        
+        if path == None:
+            if self.board.width * self.board.height <= self.PREVIEW_SOLVE_LIMIT:
+                path = solve(self.getGrid(), moving, source, "astar").path
+            else:
+                path = self.previewPath # the last path stays until the field gets there
+        
+        self.showPreview(path)
+    
+    def showPreview(self, path):
+        # only the tiles that joined or left the path are painted (the origin and the target are never painted over)
+        if path is not self.previewPath:
+            tiles = set(path)
             
-            self.updateTilesState(self.algorithm.seen, "seen")
-            self.updateTilesState(self.algorithm.path, "path")
-            self.updateTilesState([self.algorithm.getCurrent()], "current")
+            self.board.paint([tile for tile in self.previewPath if tile not in tiles], TILE)
+            self.board.paint(path, PATH)
+            self.previewPath = path
     
+    def togglePreview(self):
+        self.preview = not self.preview
+        
+        if not self.preview:
+            self.showPreview([])
     
+    def applyChanges(self, seen, previous, current, removed, added, unseen = ()):
+        # unseen are only reported when moving a replay backwards
+        self.board.applyChanges(seen, previous, current, removed, added, unseen)
     
-    def drawGrid(self, screen): 
-        # + 1 so that the last lines are included
-        for w in range(0, self.WIDTH + 1, self.TILE_W):
-            pygame.draw.line(screen, self.colorPalette["DARKBLUE"], (w, self.Y_OFFSET), (w, self.HEIGHT + self.Y_OFFSET), self.LINE_W)
+    def stepsThisFrame(self):
+        # this frame's share of steps, infinite when the speed is instant
+        if self.speed == None:
+            return float('inf')
+        
+        self.stepCredit += self.speed / self.FPS
+        steps = floor(self.stepCredit)
+        self.stepCredit -= steps
         
-        for h in range(self.Y_OFFSET, self.HEIGHT + self.Y_OFFSET + 1, self.TILE_W):
-            pygame.draw.line(screen, self.colorPalette["DARKBLUE"], (0, h), (self.WIDTH, h), self.LINE_W)
+        return steps
     
-    def drawTiles(self, screen):
-        for row in self.tiles:
-            for tile in row:
-                state = tile.getState()
-                
-                color = self.colorPalette["GRAY"] # default is gray
-                
-                # with python 3.10 a switch case statement would work 
-                if state == "wall":
-                    color = self.colorPalette["DARKBLUE"]
-                
-                elif state == "seen":
-                    color = self.colorPalette["BLUE"]
-
-                elif state == "path":
-                    color = self.colorPalette["MINT"]
-                
-                elif state == "current":
-                    color = self.colorPalette["ORANGE"]
-                    
-                elif state == "origin":
-                        color = self.colorPalette["GREEN"]
+    def runSteps(self):
+        # runs this frame's share of steps, or as many as fit in the frame budget
+        #   -> returns the tiles seen by those steps, every step is added to the recording of the search
+        steps = self.stepsThisFrame()
+        self.frameSteps = 0
+        seen = []
+        status = 0
+        
+        if self.metrics != None and self.measured is not self.algorithm:
+            self.metrics.startSolve(self.algorithmSelected)
+            self.measured = self.algorithm
+        
+        frameStart = time.perf_counter()
+        deadline = frameStart + self.frameBudget
+        
+        while steps > 0:
+            if self.metrics != None:
+                start = time.perf_counter()
+                status = self.algorithm.stepSearch()
                 
-                elif state == "target":
-                    color = self.colorPalette["RED"]
+                if status != -1:
+                    self.metrics.step(self.algorithm.frontierSize(), time.perf_counter() - start)
+            else:
+                status = self.algorithm.stepSearch()
+            
+            if status != -1:
+                seen += self.recording.recordStep(self.algorithm)
+            
+            # stop when the target is found (1) or there is nothing left to explore (-1)
+            if status != 0:
+                self.solved = True
                 
-                pygame.draw.rect(screen, color, tile.getRect())
+                if self.metrics != None:
+                    self.metrics.endSolve(status, len(self.algorithm.path) if status == 1 else None)
+                break
+            
+            steps -= 1
+            self.frameSteps += 1
+            
+            # the steps that don't fit in this frame are dropped, so a slow search doesn't freeze the ui
+            if time.perf_counter() > deadline:
+                break
+        
+        self.searchSeconds += time.perf_counter() - frameStart
+        
+        # the finished search goes to the cache, so running it again only plays it back
+        if status != 0:
+            self.recording.finish(self.algorithm, status)
+            self.cacheSolution(self.recording, self.searchSeconds)
+            self.recording = None
+        
+        return seen
+    
+    def cacheSolution(self, trace, seconds):
+        # the path of a weighted algorithm costs what its tiles cost, like solve() adds it up
+        costs = self.board.getCosts() if self.algorithmsByLabel[self.algorithmSelected].weighted else None
+        solution = Solution(self.algorithmSelected, trace.getPath(), trace.steps, seconds, costs)
+        self.solutions.put(self.solutionKey, solution, trace)
+    
+    def recordFrame(self, update, draw, flip):
+        # seconds the last frame spent in update, drawing and updating the display
+        if self.metrics == None:
+            return
+        
+        live = self.algorithm != None and self.race == None and self.replay == None and not self.solved
+        self.metrics.frame(update, draw, flip, self.frameSteps if live else 0, len(self.algorithm.path) if live else None)
+        self.frameSteps = 0
+    
+    def drawMetrics(self, screen, full = False):
+        # draws the metrics in a line at the bottom of the menu, returns the rects that have to be updated on the display
+        if self.metrics == None:
+            return []
+        
+        now = time.perf_counter()
+        if not full and now - self.metricsShown < 0.25:
+            return []
+        
+        self.metricsShown = now
+        self.metricsText = self.metrics.summary()
+        
+        lineH = self.metricsFont.get_linesize()
+        rect = pygame.Rect(0, self.Y_OFFSET - lineH - 4, self.WIDTH, lineH + 2)
+        
+        pygame.draw.rect(screen, self.colorPalette["GRAY"], rect)
+        screen.blit(self.metricsFont.render(self.metricsText, True, self.colorPalette["DARKBLUE"]), (10, rect.y + 1))
+        
+        return [rect]
+    
+    def drawBoard(self, screen):
+        # draws the tiles in the viewport all at once, returns the rect of the viewport
+        #   - the board is turned into an image with one pixel per tile (its palette are the colors of the states)
+        #     and the visible part is scaled to the size of the tiles, so it takes about the same time at any zoom
+        #   - when a pixel is smaller than a tile the colors of the tiles it covers are averaged, so walls and
+        #     paths thinner than a pixel don't disappear
+        viewport = pygame.Rect(self.camera.left, self.camera.top, self.camera.width, self.camera.height)
+        
+        screen.set_clip(viewport)
+        screen.fill(self.colorPalette["GRAY"], viewport)
+        
+        x0, y0, x1, y1 = self.camera.visible()
+        left, top = self.camera.toScreen(x0, y0)
+        right, bottom = self.camera.toScreen(x1, y1)
+        
+        if x1 > x0 and y1 > y0:
+            visible = self.boardImage(self.board).subsurface((x0, y0, x1 - x0, y1 - y0))
+            size = (max(right - left, 1), max(bottom - top, 1))
+            
+            if self.camera.scale < 1:
+                screen.blit(pygame.transform.smoothscale(visible.convert(24), size), (left, top))
+            else:
+                screen.blit(pygame.transform.scale(visible, size), (left, top))
+        
+        if self.camera.scale >= self.LINE_SCALE:
+            self.drawGrid(screen, x0, y0, x1, y1)
+        else:
+            # without lines the edge of the board is drawn so tiles can be told apart from the background
+            pygame.draw.rect(screen, self.colorPalette["DARKBLUE"], (left - 1, top - 1, right - left + 2, bottom - top + 2), 1)
+        
+        screen.set_clip(None)
+        return viewport
+    
+    def boardImage(self, board):
+        # board as an 8 bit image that uses the states as they are (no copy unless there is terrain), a pixel per tile
+        image = pygame.image.frombuffer(board.shaded(), (board.width, board.height), "P")
+        image.set_palette(self.shades)
+        return image
+    
+    def drawGrid(self, screen, x0, y0, x1, y1): 
+        # lines around the tiles from (x0, y0) to (x1, y1)
+        left, top = self.camera.toScreen(x0, y0)
+        right, bottom = self.camera.toScreen(x1, y1)
+        
+        # + 1 so that the last lines are included
+        for x in range(x0, x1 + 1):
+            w = self.camera.toScreen(x, y0)[0]
+            pygame.draw.line(screen, self.colorPalette["DARKBLUE"], (w, top), (w, bottom), self.LINE_W)
+        
+        for y in range(y0, y1 + 1):
+            h = self.camera.toScreen(x0, y)[1]
+            pygame.draw.line(screen, self.colorPalette["DARKBLUE"], (left, h), (right, h), self.LINE_W)
+    
+    def tileRect(self, x, y):
+        # rect of tile (x, y) inside its lines, the menu offset is included in the height
+        left, top = self.camera.toScreen(x, y)
+        size = self.camera.scale
+        
+        return pygame.Rect(
+            left + self.RECT_OFF + 1, 
+            top + self.RECT_OFF + 1, 
+            size - self.RECT_OFF * 2 - 1, 
+            size - self.RECT_OFF * 2 - 1,
+            )
+    
+    def isVisible(self, x, y):
+        x0, y0, x1, y1 = self.camera.visible()
+        return x0 <= x < x1 and y0 <= y < y1
                 
+    def paneRect(self, n):
+        # the board is split in 4 panes, from left to right and top to bottom
+        w = self.WIDTH // 2
+        h = self.HEIGHT // 2
+        
+        return pygame.Rect((n % 2) * w, self.Y_OFFSET + (n // 2) * h, w, h)
+    
+    def drawRace(self, screen, full):
+        # draws the board of every pane, only the tiles that changed unless full is true
+        # returns the list of rects that have to be updated on the display
+        rects = []
+        
+        for n, pane in enumerate(self.race.panes):
+            area = self.paneRect(n)
+            inner = area.inflate(-2, -2) # inside the border
+            board = pane.board
+            dirty = board.takeDirty()
+            
+            # the whole board of the pane is scaled to fit it, like the board is drawn when zoomed out (see drawBoard)
+            if full or dirty == None or dirty:
+                screen.blit(pygame.transform.scale(self.boardImage(board), inner.size), inner)
+                        
+                pygame.draw.rect(screen, self.colorPalette["DARKBLUE"], area, 1)
+                rects.append(area)
+            
+            # the tiles may have been drawn over the label
+            label = self.smallFont.render(pane.label if pane.replay != None else pane.label + " ...", True, self.colorPalette["DARKBLUE"], self.colorPalette["GRAY"])
+            rects.append(screen.blit(label, (area.x + 6, area.y + 4)))
+            
+        if self.race.ready() and self.race.finished():
+            if self.summary == None:
+                self.summary = self.renderSummary()
+            
+            rect = self.summary.get_rect(center = (self.WIDTH // 2, self.Y_OFFSET + self.HEIGHT // 2))
+            rects.append(screen.blit(self.summary, rect))
+            
+        return rects
+    
+    def renderSummary(self):
+        # table with the steps, path length and time of every algorithm of the race
+        rows = [("", "steps", "path", "time")]
+        
+        for pane in self.race.panes:
+            solution = pane.solution
+            rows.append((
+                pane.label, 
+                str(solution.expanded), 
+                str(solution.cost) if solution.found() else "-", 
+                "%.1f ms" % (solution.seconds * 1000),
+                ))
+        
+        font = self.smallFont
+        padding = 12
+        
+        # every column is as wide as its widest cell
+        widths = [max(font.size(row[c])[0] for row in rows) + padding * 2 for c in range(len(rows[0]))]
+        lineH = font.get_linesize()
+        
+        surface = pygame.Surface((sum(widths) + padding * 2, lineH * len(rows) + padding * 2))
+        surface.fill(self.colorPalette["GRAY"])
+        pygame.draw.rect(surface, self.colorPalette["DARKBLUE"], surface.get_rect(), 2)
+        
+        for r, row in enumerate(rows):
+            x = padding
+            for c, cell in enumerate(row):
+                surface.blit(font.render(cell, True, self.colorPalette["DARKBLUE"]), (x + padding, padding + r * lineH))
+                x += widths[c]
+        
+        return surface
+    
+    def startRace(self):
+        # every algorithm is solved in its own process from the same snapshot of the map
+        if self.pool == None:
+            self.pool = ProcessPoolExecutor(max_workers = len(self.raceAlgorithms))
+        
+        grid = self.getGrid()
+        walls = self.board.getWalls()
+        
+        mapKey = self.board.mapKey()
+        
+        panes = []
+        for label, name in self.raceAlgorithms:
+            # algorithms already solved on this map don't need a worker, their result is ready
+            key = (mapKey, self.origin, self.target, label)
+            cached = self.solutions.get(key)
+            
+            if cached != None:
+                future = Future()
+                future.set_result(cached)
+            else:
+                future = self.pool.submit(solveTraced, grid, self.origin, self.target, name)
+            
+            panes.append(Pane(label, future, walls, self.board.width, self.board.height, self.origin, self.target, key))
+        
+        self.race = Race(panes)
+        self.summary = None
+        
+        # the panes are drawn instead of the board
+        self.background = None
+    
+    def endRace(self):
+        # goes back to showing the board
+        if self.race != None:
+            self.race.cancel()
+            self.race = None
+            self.background = None
+    
+    def quit(self):
+        if self.pool != None:
+            self.pool.shutdown(wait = False, cancel_futures = True)
+    
+    def layoutButtons(self, labels, font, top, bottom, margin = 60):
+        # returns buttons for labels spread evenly in rows between top and bottom, using as few rows as fit the width
+        space = self.WIDTH - margin * 2
+        gap = 40
+        
+        rows = [[]]
+        used = 0
+        for label in labels:
+            w = font.size(label)[0] + gap
+            
+            if rows[-1] and used + w > space:
+                rows.append([])
+                used = 0
+            
+            rows[-1].append(label)
+            used += w
+        
+        buttons = []
+        for r, row in enumerate(rows):
+            y = top + (bottom - top) * (r + 0.5) / len(rows) - font.size(row[0])[1] / 2
+            
+            # the space left is split evenly around the buttons
+            spacing = (space - sum(font.size(label)[0] for label in row)) / len(row)
+            x = margin + spacing / 2
+            
+            for label in row:
+                buttons.append(Button(round(x), round(y), label, font, self.colorPalette))
+                x += font.size(label)[0] + spacing
+        
+        return buttons
+    
     def drawButtons(self, screen):
         for button in self.algButtons:
             button.draw(screen)
             
         for key in self.otherButtons:
             self.otherButtons[key].draw(screen)
+            
+        self.speedSlider.draw(screen)
     
     def clickDown(self, x, y, left, state): # update tiles according to a click down and and x,y coord of the mouse
         # left argument is true if it was a left click, false if it was a right click
         if (y < self.Y_OFFSET):
             self.menuClick(x, y, state)
+        
+        # shift and left click moves the camera, like the middle button
+        elif left and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            self.startPan(x, y)
                     
         elif state == "draw":
-            if self.originTile.wasItClicked(x, y):
+            # a click on the board of a finished race goes back to the board
+            if self.race != None:
+                self.endRace()
+                return
+            
+            # the board is about to change, so the replay doesn't match it anymore
+            self.replay = None
+            
+            if self.pixelsToGrid(x, y) == self.origin:
                 self.originDragged = True
                 
-            elif self.targetTile.wasItClicked(x, y):
+            elif self.pixelsToGrid(x, y) == self.target:
                 self.targetDragged = True
                 
             elif left:
@@ -187,8 +749,29 @@ class Grid:
                 
             else:
                 self.rightBeingClicked = True
+            
+            # the preview is drawn on a board without the last search
+            if self.preview and (self.originDragged or self.targetDragged):
+                self.removePathGrid()
+                self.previewPath = []
+    
+    def startPan(self, x, y):
+        # the camera follows the mouse until the button is released
+        if y >= self.Y_OFFSET:
+            self.panning = (x, y)
+    
+    def zoom(self, steps):
+        # zooms in (steps > 0) or out around the mouse
+        (x, y) = pygame.mouse.get_pos()
+        
+        if y >= self.Y_OFFSET:
+            self.camera.zoomAt(steps, x, y)
+            self.board.allDirty = True
     
     def menuClick(self, x, y, state):
+        # buttons may change their highlight, so the cached menu has to be rendered again
+        self.background = None
+        
         if state == "draw":
             for button in self.algButtons:
                 if button.clicked(x, y):
@@ -197,44 +780,209 @@ class Grid:
         
         if state == "draw":
             if self.otherButtons["Maze"].clicked(x, y): # generate a maze
+                seed = random.getrandbits(63) # kept with the map, so the same maze can be generated again
+                
                 self.mazeGen = Maze(
-                    len(self.tiles[0]), 
-                    len(self.tiles), 
-                    self.pixelsToGrid(*self.originTile.getPosition()), 
-                    self.pixelsToGrid(*self.targetTile.getPosition())
+                    self.board.width, 
+                    self.board.height, 
+                    self.origin, 
+                    self.target,
+                    seed
                 )
                 
+                start = time.perf_counter()
                 newMap = self.mazeGen.createMaze(self.nSolutions)
-                self.changeToNewMap(newMap)
+                
+                if self.metrics != None:
+                    self.metrics.maze(time.perf_counter() - start)
+                self.changeToNewMap(newMap, seed)
             
             elif self.otherButtons["Clear"].clicked(x, y):
                 self.changeToNewMap() # leave empty to clear it
+                
+            elif self.otherButtons["Replay"].clicked(x, y):
+                self.replayMode = not self.replayMode
+                
+                if self.replayMode:
+                    self.otherButtons["Replay"].highlightTrue()
+                else:
+                    self.otherButtons["Replay"].highlightFalse()
+                    
+            elif self.otherButtons["Race"].clicked(x, y):
+                self.raceMode = not self.raceMode
+                
+                if self.raceMode:
+                    self.otherButtons["Race"].highlightTrue()
+                else:
+                    self.otherButtons["Race"].highlightFalse()
+                    self.endRace()
+        
+        if self.speedSlider.clicked(x, y):
+            self.sliderDragged = True
+            self.speedSlider.moveTo(x)
+            self.updateSpeed()
+            
+    def updateSpeed(self):
+        # turns the position of the slider into steps per second
+        value = self.speedSlider.value
+        
+        if value >= 1:
+            self.speed = None
+            self.speedSlider.setText("Instant")
+        else:
+            self.speed = self.minSpeed * (self.maxSpeed / self.minSpeed) ** value
+            self.speedSlider.setText(str(round(self.speed)) + " steps/s")
+            
+        # the slider is part of the cached menu
+        self.background = None
+            
+    
+    def keyDown(self, key, state):
+        # keys for replays, returns the state the game should be in
+        if pygame.key.get_mods() & pygame.KMOD_CTRL:
+            if key == pygame.K_s and state == "draw":
+                self.saveMap()
+            elif key == pygame.K_l and state == "draw":
+                self.loadMap()
+            
+            return state
+        
+        if key == pygame.K_l and state == "draw":
+            return self.loadTrace()
+        
+        if key == pygame.K_m:
+            self.toggleMetrics()
+            return state
+        
+        if pygame.K_0 <= key <= pygame.K_9:
+            self.terrain = None if key == pygame.K_0 else key - pygame.K_0
+            return state
+        
+        if key == pygame.K_p:
+            self.togglePreview()
+            return state
         
-        if self.otherButtons["Slow"].clicked(x, y):
-            self.FPS = self.fpsSlow
-            self.otherButtons["Slow"].highlightTrue()
-            self.otherButtons["Fast"].highlightFalse()
+        if key == pygame.K_f:
+            self.camera.fit()
+            self.board.allDirty = True
+            return state
+        
+        if key == pygame.K_d and self.metrics != None:
+            self.metrics.saveJson(self.metricsFile + ".json")
+            self.metrics.saveCsv(self.metricsFile + ".csv")
+            return state
+        
+        if self.replay == None:
+            return state
+        
+        # move backwards / forwards a hundredth of the trace, or to the start / end
+        jump = max(1, self.replay.trace.steps // 100)
+        
+        if key == pygame.K_LEFT:
+            self.applyChanges(*self.replay.seek(self.replay.position - jump))
+        
+        elif key == pygame.K_RIGHT:
+            self.applyChanges(*self.replay.seek(self.replay.position + jump))
+            
+        elif key == pygame.K_HOME:
+            self.applyChanges(*self.replay.seek(0))
             
-        elif self.otherButtons["Fast"].clicked(x, y):
-            self.FPS = self.fpsFast
-            self.otherButtons["Fast"].highlightTrue()
-            self.otherButtons["Slow"].highlightFalse()
+        elif key == pygame.K_END:
+            self.applyChanges(*self.replay.seek(self.replay.trace.steps))
+        
+        elif key == pygame.K_s:
+            self.replay.trace.save(self.traceFile)
             
+        return state
+    
+    def toggleMetrics(self):
+        # turning them off forgets what was collected
+        if self.metrics == None:
+            self.metrics = Metrics(self.FPS)
+        else:
+            self.metrics = None
+        
+        self.measured = None
+        self.background = None # the line at the bottom of the menu appears / disappears
+    
+    def loadTrace(self):
+        # loads the trace in traceFile with its map and starts playing it
+        try:
+            trace = Trace.load(self.traceFile)
+        except (OSError, ValueError):
+            return "draw"
+        
+        self.placeMap(trace.walls, trace.width, trace.height, trace.start, trace.target)
+        
+        for button in self.algButtons:
+            if button.text == trace.algorithm:
+                self.updateAlgorithm(button)
+                self.background = None
+        
+        self.endRace()
+        self.solved = False
+        self.stepCredit = 0
+        self.replay = Replay(trace)
+        
+        return "solve"
+    
+    def saveMap(self):
+        # the walls, origin and target (and the seed of the maze) to mapFile
+        walls = self.board.getWalls()
+        W = self.board.width
+        rows = (walls[i:i + W] for i in range(0, len(walls), W))
+        
+        saveBinary(self.mapFile, rows, W, self.board.height, self.origin, self.target, self.seed)
+    
+    def loadMap(self):
+        # replaces the board with the map in mapFile
+        try:
+            with BinaryMap(self.mapFile) as binary:
+                self.placeMap(binary.walls(), binary.width, binary.height, binary.origin, binary.target, binary.seed)
+        except (OSError, ValueError):
+            return
+        
+        self.endRace()
     
-    def changeToNewMap(self, newMap = None):
+    def placeMap(self, walls, width, height, origin, target, seed = None):
+        # puts walls (flat, see Board.getWalls) on the board with its origin and target
+        #   -> the board takes the size of the map
+        if (width, height) != (self.board.width, self.board.height):
+            self.resizeBoard(width, height)
+        
+        self.board.set(*self.origin, TILE)
+        self.board.set(*self.target, TILE)
+        
+        self.origin = origin
+        self.target = target
+        
+        self.board.set(*self.origin, ORIGIN)
+        self.board.set(*self.target, TARGET)
+        
+        self.changeToNewMap(walls, seed)
+    
+    def resizeBoard(self, width, height):
+        # replaces the board with an empty one of width x height tiles that fits in the window
+        self.board = Board(width, height)
+        self.camera = Camera(0, self.Y_OFFSET, self.WIDTH, self.HEIGHT, width, height, self.TILE_W)
+        self.camera.fit()
+        
+        self.origin = (0, 0)
+        self.target = (width - 1, height - 1)
+        self.board.set(*self.origin, ORIGIN)
+        self.board.set(*self.target, TARGET)
+        
+        self.algorithm = None
+        self.replay = None
+    
+    def changeToNewMap(self, newMap = None, seed = None):
+        self.replay = None
+        self.seed = seed
+        
         if newMap == None:
-            for h in range(len(self.tiles)):
-                for w in range(len(self.tiles[0])):
-                    if self.tiles[h][w] != self.originTile and self.tiles[h][w] != self.targetTile:
-                        self.tiles[h][w].updateState("tile")
+            self.board.clear()
         else: 
-            for h in range(len(newMap)):
-                for w in range(len(newMap[h])):
-                    if self.tiles[h][w] != self.originTile and self.tiles[h][w] != self.targetTile:
-                        if newMap[h][w]:
-                            self.tiles[h][w].updateState("wall")
-                        else:
-                            self.tiles[h][w].updateState("tile")
+            self.board.setWalls(newMap, [self.board.index(*self.origin), self.board.index(*self.target)])
         
                     
     def updateAlgorithm(self, newAlgorithm):
@@ -247,61 +995,92 @@ class Grid:
         
 
     def clickUp(self): 
+        # the preview stays on the board until the next search, but it isn't updated anymore
+        self.previewPath = []
+        
         self.leftBeingClicked = False
         self.rightBeingClicked = False
         self.originDragged = False
         self.targetDragged = False
+        self.sliderDragged = False
+        self.panning = None
         
     def defineAlgorithm(self):
         # the map is not solved
         self.solved = False
+        self.stepCredit = 0
         
         # if this is not the first time running an algorithm we have to clean all non wall / tile tiles
         self.removePathGrid()
         
-        originPos = self.pixelsToGrid(*self.originTile.getPosition())
-        targetPos = self.pixelsToGrid(*self.targetTile.getPosition())
+        if self.raceMode:
+            self.startRace()
+            return
         
-        if self.algorithmSelected == "Breadth FS":
-            self.algorithm = BFS(originPos, targetPos, self.getGrid())
-            
-        elif self.algorithmSelected == "Depth FS":
-            self.algorithm = DFS(originPos, targetPos, self.getGrid())
+        self.endRace()
+        self.measured = None
+        
+        # the same search on the same map was already run, so it is only played back
+        self.solutionKey = (self.board.mapKey(), self.origin, self.target, self.algorithmSelected)
+        cached = self.solutions.get(self.solutionKey)
         
-        elif self.algorithmSelected == "Greedy FS":
-            self.algorithm = GFS(originPos, targetPos, self.getGrid())
+        if cached != None:
+            self.algorithm = None
+            self.recording = None
+            self.replay = Replay(cached[1])
+            return
+        
+        originPos = self.origin
+        targetPos = self.target
+        
+        algorithm = self.algorithmsByLabel[self.algorithmSelected]
+        
+        # the module of an algorithm is imported the first time it runs, a plugin that can't be used doesn't start
+        # a search (see algorithms/Registry)
+        try:
+            if algorithm.incremental:
+                self.algorithm = self.replan(algorithm, originPos, targetPos)
+            else:
+                self.algorithm = algorithm.create(originPos, targetPos, self.getGrid(), self.board.getCosts() if algorithm.weighted else None)
+        except Exception as error:
+            warnings.warn("could not run " + algorithm.label + ": " + str(error))
+            self.algorithm = None
+            self.solved = True
+            return
             
-        elif self.algorithmSelected == "A-Star":
-            self.algorithm = AStar(originPos, targetPos, self.getGrid())
+        # solve it up front so it can be replayed
+        if self.replayMode:
+            start = time.perf_counter()
+            trace = Trace.record(self.algorithm, self.board.getWalls(), self.algorithmSelected)
+            self.cacheSolution(trace, time.perf_counter() - start)
+            
+            self.replay = Replay(trace)
+        else:
+            # live searches are recorded a step at a time as they run (see runSteps)
+            self.replay = None
+            self.recording = Trace.begin(self.algorithm, self.board.getWalls(), self.algorithmSelected)
+            self.searchSeconds = 0
+    
+    def replan(self, algorithm, origin, target):
+        # the last search of an incremental algorithm (see algorithms/LPAStar) with the walls edited since then,
+        # or a new one if it can't be reused
+        #   -> the edits are taken even when it is not reused, the new search starts from the walls as they are now
+        edits = self.board.takeEdits()
+        planner = self.planner
+        
+        if planner == None or edits == None or self.plannerName != algorithm.name or planner.start != origin or planner.target != target:
+            self.planner = algorithm.create(origin, target, self.getGrid())
+            self.plannerName = algorithm.name
+        else:
+            planner.updateWalls(self.board.getWalls(), edits)
+        
+        return self.planner
     
     def removePathGrid(self):
-        for row in self.tiles:
-            for tile in row:
-                tmp = tile.getState()
-                if tmp != "wall" and tmp != "origin" and tmp != "target":
-                    tile.updateState("tile")
+        self.board.clearSearch()
     
     def getGrid(self):
-        grid = []
-    
-        for row in self.tiles:
-            boolRow = []
-            for tile in row:
-                
-                if tile.getState() == "wall":
-                    boolRow.append(True)
-                else: 
-                    boolRow.append(False)
-                    
-            grid.append(boolRow)
-        
-        return grid
+        return self.board.getGrid()
     
-    def updateTilesState(self, coords, state):
-        for coord in coords:
-            (x, y) = coord
-            if self.tiles[y][x] != self.originTile and self.tiles[y][x] != self.targetTile:
-                self.tiles[y][x].updateState(state)
-        
     def pixelsToGrid(self, x, y):
-        return (floor(x / self.TILE_W), floor((y - self.Y_OFFSET) / self.TILE_W))
+        return self.camera.toTile(x, y)
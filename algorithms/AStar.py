@@ -1,7 +1,13 @@
-from collections import deque
-from util.Node import Node
+import heapq
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+from util.Adjacency import Adjacency, RIGHT, DOWN, UP, LEFT
 
-# greedy first search using manhattan distance as a heuristic
+# order the neighbors are pushed in
+ORDER = (LEFT, UP, DOWN, RIGHT)
+
+# a star search using manhattan distance as a heuristic
 
 class AStar:
     def __init__(self, start, target, grid):
@@ -12,96 +18,119 @@ class AStar:
         self.width = len(self.grid[0]) - 1
         self.height = len(self.grid) - 1
 
-        self.current = Node(*self.start, []) # pass an empty path
+        self.current = self.start
+
+        # the search itself works with cell ids (y * W + x) and the moves compiled from the walls, see util/Adjacency
+        self.W = self.width + 1
+        self.adjacency = Adjacency.fromGrid(self.grid)
+        self.neighbors = self.adjacency.neighbors(ORDER)
+        self.goal = self.index(self.target)
 
-        # seen[y][x] tells you if it has been seen before (true) or not (false)        
-        self.seen = set()
+        # seen tells you if (x, y) has been seen before, seen.flags[y * W + x] is 1 if it has (see util/Visited)
+        self.seen = Visited(self.W, self.height + 1, [self.start])
         
-        self.path = [] # keeps track of the path to the current node
+        # keeps track of the tile each seen tile was reached from, the path to the current node is rebuilt from it
+        self.parents = Parents(self.width + 1, self.height + 1)
         
-        # append at the right and pop from the right
-        self.frontier = list([(self.current, self.manhattanDistance(start))])
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.start, self.W)
         
-    def getCurrent(self):
-        return (self.current.x, self.current.y)
-    
-    def getNeighbors(self, x, y):
-        neighbors = []
+        # length of the shortest path found so far to each seen tile
+        self.pathLength = {self.index(self.start) : 0}
         
-        # neighbors if they are in bound, and they have not been seen before, and they are not walls     
-        if (x - 1 >= 0) and (x - 1, y) not in self.seen and self.grid[y][x-1] == False:
-            neighbors.append((x-1, y))
-            
-        if (y - 1 >= 0) and (x, y - 1) not in self.seen and self.grid[y-1][x] == False:
-            neighbors.append((x, y-1))
-            
-        if (y + 1 <= self.height) and (x, y + 1) not in self.seen and self.grid[y+1][x] == False:
-            neighbors.append((x, y+1))
-            
-        if (x + 1 <= self.width) and (x  + 1, y) not in self.seen and self.grid[y][x+1] == False:
-            neighbors.append((x+1, y))
+        # tiles that have already been expanded, their path length can't improve anymore (by cell id, like seen)
+        self.closed = Visited(self.W, self.height + 1)
         
-            
-        return neighbors
+        # heap of (path length + manhattan distance, manhattan distance, order, cell id)
+        #   -> ties are broken by the tile closest to the goal and then by the order they were pushed in
+        #   -> a tile can be pushed again when a shorter path to it is found, the old entry is skipped when popped
+        self.pushed = 0
+        self.frontier = []
+        self.push(self.index(self.start), 0)
+        
+    def index(self, tile):
+        x, y = tile
+        return y * self.W + x
+
+    def getCurrent(self):
+        return self.current
+    
+    def frontierSize(self):
+        # nodes waiting to be expanded, entries in the heap, including the ones that will be skipped (see util/Metrics)
+        return len(self.frontier)
+    
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+    
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+    
+    def getNeighbors(self, i):
+        # neighbors that are not walls (see util/Adjacency) and have not been expanded before
+        closed = self.closed.flags
+        return [i + offset for offset in self.neighbors[self.adjacency.moves[i]] if not closed[i + offset]]
         
     def stepSearch(self):
-        if self.frontier: # if its not empty
-            self.current = self.chooseMinimum()
-            x = self.current.x
-            y = self.current.y
-                                    
-            self.path = self.current.path
+        i = self.chooseMinimum()
+        
+        if i != None: # if the frontier was not empty
+            self.current = (i % self.W, i // self.W)
             
             # check if we reached target
-            if (x, y) == self.target:
+            if i == self.goal:
                 return 1
             
-            tmpPath = list(self.path)
-            tmpPath.append((x, y))
+            length = self.pathLength[i] + 1
             
-            # add to the frontier calculating the value for the length of the path + the manhattan distance
-            for neighbor in self.getNeighbors(x, y):
-                tmpX, tmpY = neighbor
-                self.seen.add((tmpX, tmpY))
-                
-                n = Node(tmpX, tmpY, tmpPath)
-                self.frontier.append((n, len(tmpPath) + self.manhattanDistance((tmpX, tmpY))))
+            # add to the frontier the neighbors that were not seen or that were reached by a longer path
+            for neighbor in self.getNeighbors(i):
+                if length < self.pathLength.get(neighbor, float('inf')):
+                    if not self.seen.flags[neighbor]:
+                        self.seen.addIndex(neighbor)
+                        self.changes.seen.append(neighbor)
+                    
+                    self.parents.setIndex(neighbor, i)
+                    self.push(neighbor, length)
                 
             return 0
             
         else:
             return -1
     
+    def push(self, i, length):
+        self.pathLength[i] = length
+        
+        distance = self.manhattanDistance(i)
+        heapq.heappush(self.frontier, (length + distance, distance, self.pushed, i))
+        self.pushed += 1
+    
     def chooseMinimum(self):
         # choose the node that has the least value of path lenght + manhattan distance
-        
         #       -> if there is a tie choose the node closest to the goal
+        # returns None when the frontier is empty
         
-        minValue = float('inf')
-        minNode = None
-
-        for node in self.frontier:
-            if node[1] < minValue:
-                minValue = node[1]
-                minNode = node[0]
+        while self.frontier:
+            value, distance, _, tile = heapq.heappop(self.frontier)
             
-            elif node[0] == minValue:
-                if len(node[0]) > len(minNode):
-                    minNode = node[0]
-                
-        self.frontier.remove((minNode, minValue))
-        
-        return minNode
-        
+            # skip entries of tiles that were expanded already or that have been pushed again with a shorter path
+            if self.closed.flags[tile] or value - distance != self.pathLength[tile]:
+                continue
             
-
+            self.closed.addIndex(tile)
+            return tile
+        
+        return None
+    
     def manhattanDistance(self, node):
-        # returns the manhattan distance of a node to the target
+        # returns the manhattan distance of a node (cell id) to the target
         # if node -> (w1, h1)
         # and target -> (w2, h2)
         
         # manhattan distance is = |w2-w1|+|h2-h1|
-        w1, h1 = node
+        w1, h1 = node % self.W, node // self.W
         w2, h2 = self.target
         
         return abs(w2 - w1) + abs(h2 - h1)
@@ -0,0 +1,195 @@
+import heapq
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+
+# bidirectional a star search using manhattan distance as a heuristic
+#   - one A* grows from the start towards the target and another one from the target towards the start, taking turns
+#   - every time a tile reached by both sides gets a shorter path, the length through it is the best path found so far
+#   - they stop when one of the sides can't find anything shorter than that (the heuristic never overestimates)
+#   - each side is its own tree in the parent table (layer 0 from the start, layer 1 from the target)
+#     and the joined path is stored in layer 2 once it is found
+
+FORWARD = 0
+BACKWARD = 1
+JOINED = 2
+
+class BiAStar:
+    def __init__(self, start, target, grid):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+        self.grid = grid # grid is an array where grid[y][x] tells you if it is a wall (true) or a tile (false)
+
+        self.width = len(self.grid[0]) - 1
+        self.height = len(self.grid) - 1
+
+        # nodes are (x, y, side)
+        self.current = (*self.start, FORWARD)
+
+        # seen by either side
+        self.seen = Visited(self.width + 1, self.height + 1, [self.start, self.target])
+
+        self.parents = Parents(self.width + 1, self.height + 1, 3)
+
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.current)
+
+        # for each side -> length of the shortest path found so far to each tile, and tiles already expanded
+        self.pathLength = ({self.start : 0}, {self.target : 0})
+        self.closed = (set(), set())
+
+        # for each side a heap of (path length + manhattan distance, manhattan distance, order, tile)
+        #   -> the forward side measures the distance to the target and the backward side to the start
+        #   -> a tile can be pushed again when a shorter path to it is found, the old entry is skipped when popped
+        self.pushed = 0
+        self.frontiers = ([], [])
+        self.push(FORWARD, self.start, 0)
+        self.push(BACKWARD, self.target, 0)
+
+        self.side = BACKWARD # sides take turns, the forward side goes first
+
+        # length of the shortest path found so far, and the tile where both sides meet in it
+        self.best = float('inf')
+        self.meeting = None
+        self.checkMeeting(self.start)
+
+    def getCurrent(self):
+        return self.current[:2]
+
+    def frontierSize(self):
+        # nodes waiting to be expanded, of both sides, including the entries that will be skipped (see util/Metrics)
+        return len(self.frontiers[FORWARD]) + len(self.frontiers[BACKWARD])
+
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def getNeighbors(self, x, y, side):
+        neighbors = []
+        closed = self.closed[side]
+
+        # neighbors if they are in bound, and they have not been expanded before by this side, and they are not walls
+        if (x - 1 >= 0) and (x - 1, y) not in closed and self.grid[y][x-1] == False:
+            neighbors.append((x-1, y))
+
+        if (y - 1 >= 0) and (x, y - 1) not in closed and self.grid[y-1][x] == False:
+            neighbors.append((x, y-1))
+
+        if (y + 1 <= self.height) and (x, y + 1) not in closed and self.grid[y+1][x] == False:
+            neighbors.append((x, y+1))
+
+        if (x + 1 <= self.width) and (x  + 1, y) not in closed and self.grid[y][x+1] == False:
+            neighbors.append((x+1, y))
+
+        return neighbors
+
+    def stepSearch(self):
+        # nothing left to find that is shorter than the best path
+        if self.minimum(FORWARD) >= self.best or self.minimum(BACKWARD) >= self.best:
+            return self.join()
+
+        # if either side ran out of tiles (without meeting), there is no path
+        if not self.frontiers[FORWARD] or not self.frontiers[BACKWARD]:
+            return -1
+
+        side = 1 - self.side
+        self.side = side
+
+        tile = self.chooseMinimum(side)
+        self.current = (*tile, side)
+        x, y = tile
+
+        length = self.pathLength[side][tile] + 1
+
+        # add to the frontier the neighbors that were not seen by this side or that were reached by a longer path
+        for neighbor in self.getNeighbors(x, y, side):
+            if length < self.pathLength[side].get(neighbor, float('inf')):
+                if neighbor not in self.seen:
+                    self.seen.add(neighbor)
+                    self.changes.seen.append(neighbor)
+
+                self.parents.set((*neighbor, side), self.current)
+                self.push(side, neighbor, length)
+
+                self.checkMeeting(neighbor)
+
+        return 0
+
+    def checkMeeting(self, tile):
+        # if both sides reached tile, the path through it may be the best one so far
+        if tile in self.pathLength[FORWARD] and tile in self.pathLength[BACKWARD]:
+            length = self.pathLength[FORWARD][tile] + self.pathLength[BACKWARD][tile]
+
+            if length < self.best:
+                self.best = length
+                self.meeting = tile
+
+    def push(self, side, tile, length):
+        self.pathLength[side][tile] = length
+
+        distance = self.manhattanDistance(tile, self.target if side == FORWARD else self.start)
+        heapq.heappush(self.frontiers[side], (length + distance, distance, self.pushed, tile))
+        self.pushed += 1
+
+    def clean(self, side):
+        # drops the entries on top of the heap of tiles that were expanded already or pushed again with a shorter path
+        frontier = self.frontiers[side]
+
+        while frontier:
+            value, distance, _, tile = frontier[0]
+
+            if tile in self.closed[side] or value - distance != self.pathLength[side][tile]:
+                heapq.heappop(frontier)
+            else:
+                break
+
+    def minimum(self, side):
+        # least value of path length + manhattan distance in the frontier of side, infinite if it's empty
+        self.clean(side)
+
+        if self.frontiers[side]:
+            return self.frontiers[side][0][0]
+
+        return float('inf')
+
+    def chooseMinimum(self, side):
+        # choose the node that has the least value of path lenght + manhattan distance
+        #       -> if there is a tie choose the node closest to the goal
+        self.clean(side)
+
+        tile = heapq.heappop(self.frontiers[side])[3]
+        self.closed[side].add(tile)
+
+        return tile
+
+    def join(self):
+        # stores the path from start to target in the joined layer and makes the target its current node
+        if self.meeting == None:
+            return -1
+
+        # the backward side's path goes from the target to the meeting tile, so it is reversed
+        path = self.parents.getPath((*self.meeting, FORWARD)) + [self.meeting]
+        path += reversed(self.parents.getPath((*self.meeting, BACKWARD)))
+
+        for i in range(1, len(path)):
+            self.parents.set((*path[i], JOINED), (*path[i - 1], JOINED))
+
+        self.current = (*self.target, JOINED)
+
+        return 1
+
+    def manhattanDistance(self, node, goal):
+        # returns the manhattan distance of a node to goal
+        # if node -> (w1, h1)
+        # and goal -> (w2, h2)
+
+        # manhattan distance is = |w2-w1|+|h2-h1|
+        w1, h1 = node
+        w2, h2 = goal
+
+        return abs(w2 - w1) + abs(h2 - h1)
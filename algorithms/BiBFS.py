@@ -0,0 +1,147 @@
+from collections import deque
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+
+# bidirectional breadth first search
+#   - one BFS grows from the start and another one from the target, taking turns to expand a whole layer each
+#   - once a layer touches a tile seen by the other side, the shortest path goes through the best of those contacts
+#   - each side is its own tree in the parent table (layer 0 from the start, layer 1 from the target)
+#     and the joined path is stored in layer 2 once it is found
+
+FORWARD = 0
+BACKWARD = 1
+JOINED = 2
+
+class BiBFS:
+    def __init__(self, start, target, grid):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+
+        self.grid = grid # grid is an array where grid[y][x] tells you if it is a wall (true) or a tile (false)
+
+        self.width = len(self.grid[0]) - 1
+        self.height = len(self.grid) - 1
+
+        # nodes are (x, y, side)
+        self.current = (*self.start, FORWARD)
+
+        # seen by either side, and by each side
+        self.seen = Visited(self.width + 1, self.height + 1, [self.start, self.target])
+        self.seenFrom = (Visited(self.width + 1, self.height + 1, [self.start]), Visited(self.width + 1, self.height + 1, [self.target]))
+
+        self.parents = Parents(self.width + 1, self.height + 1, 3)
+
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.current)
+
+        # append at the left and pop from the right
+        self.queues = (deque([(*self.start, FORWARD)]), deque([(*self.target, BACKWARD)]))
+
+        # side whose layer is being expanded, and how many nodes of that layer are left
+        self.side = FORWARD
+        self.layerLeft = 1
+
+        # shortest contact found so far -> (length, forward tile, backward tile)
+        self.best = (0, self.start, self.target) if self.start == self.target else None
+
+    def getCurrent(self):
+        return self.current[:2]
+
+    def frontierSize(self):
+        # nodes waiting to be expanded, of both sides (see util/Metrics)
+        return len(self.queues[FORWARD]) + len(self.queues[BACKWARD])
+
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def getNeighbors(self, x, y, side):
+        neighbors = []
+        seen = self.seenFrom[side]
+
+        # neighbors if they are in bound, and they have not been seen before by this side, and they are not walls
+        if (x + 1 <= self.width) and (x  + 1, y) not in seen and self.grid[y][x+1] == False:
+            neighbors.append((x+1, y))
+
+        if (y + 1 <= self.height) and (x, y + 1) not in seen and self.grid[y+1][x] == False:
+            neighbors.append((x, y+1))
+
+        if (y - 1 >= 0) and (x, y - 1) not in seen and self.grid[y-1][x] == False:
+            neighbors.append((x, y-1))
+
+        if (x - 1 >= 0) and (x - 1, y) not in seen and self.grid[y][x-1] == False:
+            neighbors.append((x-1, y))
+
+        return neighbors
+
+    def stepSearch(self):
+        if self.best != None and self.layerLeft == 0:
+            return self.join()
+
+        # if either side ran out of tiles, they can never meet
+        if not self.queues[FORWARD] or not self.queues[BACKWARD]:
+            return -1
+
+        side = self.side
+        other = 1 - side
+        q = self.queues[side]
+
+        self.current = q.pop()
+        self.layerLeft -= 1
+        x, y, _ = self.current
+
+        length = self.parents.depth[self.parents.index(self.current)] + 1
+
+        for neighbor in self.getNeighbors(x, y, side):
+            # the other side has been here, so the two sides can be joined through this edge
+            if neighbor in self.seenFrom[other]:
+                total = length + self.parents.depth[self.parents.index((*neighbor, other))]
+
+                if self.best == None or total < self.best[0]:
+                    if side == FORWARD:
+                        self.best = (total, (x, y), neighbor)
+                    else:
+                        self.best = (total, neighbor, (x, y))
+
+            if neighbor not in self.seen:
+                self.seen.add(neighbor)
+                self.changes.seen.append(neighbor)
+
+            self.seenFrom[side].add(neighbor)
+            self.parents.set((*neighbor, side), self.current)
+            q.appendleft((*neighbor, side))
+
+        # the layer is done -> stop if the sides met, otherwise the side with the smaller frontier goes next
+        if self.layerLeft == 0:
+            if self.best != None:
+                return self.join()
+
+            self.side = FORWARD if len(self.queues[FORWARD]) <= len(self.queues[BACKWARD]) else BACKWARD
+            self.layerLeft = len(self.queues[self.side])
+
+        return 0
+
+    def join(self):
+        # stores the path from start to target in the joined layer and makes the target its current node
+        _, forward, backward = self.best
+
+        path = self.parents.getPath((*forward, FORWARD)) + [forward]
+
+        if backward != forward:
+            path.append(backward)
+
+        # the backward side's path goes from the target to backward, so it is reversed
+        path += reversed(self.parents.getPath((*backward, BACKWARD)))
+
+        for i in range(1, len(path)):
+            self.parents.set((*path[i], JOINED), (*path[i - 1], JOINED))
+
+        self.current = (*self.target, JOINED)
+
+        return 1
@@ -1,5 +1,11 @@
 from collections import deque
-from util.Node import Node
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+from util.Adjacency import Adjacency, RIGHT, DOWN, UP, LEFT
+
+# order the neighbors are pushed in, the last one is explored first
+ORDER = (LEFT, UP, DOWN, RIGHT)
 
 class DFS:
     def __init__(self, start, target, grid):
@@ -10,68 +16,68 @@ class DFS:
         self.width = len(self.grid[0]) - 1
         self.height = len(self.grid) - 1
 
-        self.current = Node(*self.start, []) # pass an empty path
+        self.current = self.start
+
+        # the search itself works with cell ids (y * W + x) and the moves compiled from the walls, see util/Adjacency
+        self.W = self.width + 1
+        self.adjacency = Adjacency.fromGrid(self.grid)
+        self.neighbors = self.adjacency.neighbors(ORDER)
+        self.goal = self.index(self.target)
 
-        # seen[y][x] tells you if it has been seen before (true) or not (false)        
-        self.seen = set()
+        # seen tells you if (x, y) has been seen before, seen.flags[y * W + x] is 1 if it has (see util/Visited)
+        self.seen = Visited(self.W, self.height + 1, [self.start])
+        
+        # keeps track of the tile each seen tile was reached from, the path to the current node is rebuilt from it
+        self.parents = Parents(self.width + 1, self.height + 1)
         
-        self.path = [] # keeps track of the path to the current node
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.start, self.W)
         
         # append at the right and pop from the right
-        self.s = deque([self.current])
+        self.s = deque([self.index(self.start)])
         
+    def index(self, tile):
+        x, y = tile
+        return y * self.W + x
+
     def getCurrent(self):
-        return (self.current.x, self.current.y)
+        return self.current
     
-    def getNeighbors(self, x, y):
-        neighbors = []
-        
-        # neighbors if they are in bound, and they have not been seen before, and they are not walls     
-        if (x - 1 >= 0) and (x - 1, y) not in self.seen and self.grid[y][x-1] == False:
-            neighbors.append((x-1, y))
-            
-        if (y - 1 >= 0) and (x, y - 1) not in self.seen and self.grid[y-1][x] == False:
-            neighbors.append((x, y-1))
-            
-        if (y + 1 <= self.height) and (x, y + 1) not in self.seen and self.grid[y+1][x] == False:
-            neighbors.append((x, y+1))
-            
-        if (x + 1 <= self.width) and (x  + 1, y) not in self.seen and self.grid[y][x+1] == False:
-            neighbors.append((x+1, y))
-        
-            
-        return neighbors
-            
-        
-        
-         
-        
+    def frontierSize(self):
+        # nodes waiting to be expanded (see util/Metrics)
+        return len(self.s)
+    
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+    
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+    
+    def getNeighbors(self, i):
+        # neighbors that are not walls (see util/Adjacency) and have not been seen before
+        seen = self.seen.flags
+        return [i + offset for offset in self.neighbors[self.adjacency.moves[i]] if not seen[i + offset]]
+
     def stepSearch(self):
         if self.s: # if its not empty
-            self.current = self.s.pop()
-            x = self.current.x
-            y = self.current.y
-            
-            self.path = self.current.path
-            
-            
+            i = self.s.pop()
+            self.current = (i % self.W, i // self.W)
+
             # check if we reached target
-            if (x, y) == self.target:
+            if i == self.goal:
                 return 1
-            
-            tmpPath = list(self.path)
-            tmpPath.append((x, y))
-            
-            for neighbor in self.getNeighbors(x, y):
-                tmpX, tmpY = neighbor
-                self.seen.add((tmpX, tmpY))
-                
-                n = Node(tmpX, tmpY, tmpPath)
-                self.s.append(n)
-                
+
+            for neighbor in self.getNeighbors(i):
+                self.seen.addIndex(neighbor)
+                self.changes.seen.append(neighbor)
+
+                self.parents.setIndex(neighbor, i)
+                self.s.append(neighbor)
+
             return 0
-            
+
         else:
             return -1
-
-                
@@ -0,0 +1,8 @@
+from algorithms.WeightedAStar import WeightedAStar
+
+# dijkstra's algorithm -> the weighted a star without a heuristic, it expands the tiles in order of the cost of the
+# cheapest path to them, growing evenly in every direction like breadth first search does when every move costs 1
+
+class Dijkstra(WeightedAStar):
+    def heuristic(self, node):
+        return 0
@@ -0,0 +1,216 @@
+import heapq
+from util.Parents import JumpParents
+from util.Changes import Changes
+from util.Visited import Visited
+
+# jump point search, an a star that skips the tiles where nothing interesting can happen (4-connected version)
+#   - on a grid where every move costs the same there are many paths of the same length (symmetric paths),
+#     a star pushes all of them while jump point search only keeps one
+#   - from each expanded tile it moves in a straight line (a jump) until it finds the target, a wall,
+#     or a tile with a forced neighbor (a tile next to a wall corner, where another path could turn)
+#   - only those tiles (jump points) are pushed to the frontier, the tiles jumped over are shown as seen
+#   - a tile only jumps forward and to the sides of the direction it was reached from
+#   - based on the "never move diagonally" jump point finder of PathFinding.js
+
+class JPS:
+    def __init__(self, start, target, grid):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+        self.grid = grid # grid is an array where grid[y][x] tells you if it is a wall (true) or a tile (false)
+
+        self.width = len(self.grid[0]) - 1
+        self.height = len(self.grid) - 1
+
+        self.current = self.start
+
+        self.seen = Visited(self.width + 1, self.height + 1, [self.start])
+
+        # jump points only remember the jump point they were reached from, see util/Parents
+        self.parents = JumpParents(self.width + 1, self.height + 1)
+
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.start)
+
+        # length of the shortest path found so far to each jump point
+        self.pathLength = {self.start : 0}
+
+        # jump points that have already been expanded, their path length can't improve anymore
+        self.closed = set()
+
+        # heap of (path length + manhattan distance, manhattan distance, order, tile), the same as AStar
+        self.pushed = 0
+        self.frontier = []
+        self.push(self.start, 0)
+
+        # the rows as bytes (1 for the walls), so horizontal jumps can search them with find, see jumpHorizontal
+        self.rows = [bytes(row) for row in self.grid]
+
+    def getCurrent(self):
+        return self.current
+
+    def frontierSize(self):
+        # nodes waiting to be expanded, jump points in the heap, including the ones that will be skipped (see util/Metrics)
+        return len(self.frontier)
+
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def isTile(self, x, y):
+        # in bound and not a wall
+        return 0 <= x <= self.width and 0 <= y <= self.height and self.grid[y][x] == False
+
+    def getDirections(self, x, y):
+        # directions to jump from (x, y)
+        #   -> all of them from the start
+        #   -> otherwise forward, left and right of the direction (x, y) was reached from, never back
+        parent = self.parents.get((x, y))
+
+        if parent == None:
+            return [(-1, 0), (0, -1), (0, 1), (1, 0)]
+
+        px, py = parent
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+
+        if dx != 0:
+            return [(0, -1), (0, 1), (dx, 0)]
+
+        return [(-1, 0), (1, 0), (0, dy)]
+
+    def jumpHorizontal(self, x, y, dx):
+        # moves from (x, y) in direction dx until it finds a jump point, returns it or None if it hit a wall first
+        #   - every vertical jump tries horizontal jumps from each tile it goes over, so this is where most of the time
+        #     goes, instead of stepping one tile at a time the row and the ones next to it are searched with find
+        #   - a tile x has a forced neighbor when there is a tile above or below it that can't be reached by going up
+        #     or down before x, that is a wall at x - dx and a tile at x in the row above or below
+        row = self.rows[y]
+        above = self.rows[y - 1] if y > 0 else None
+        below = self.rows[y + 1] if y < self.height else None
+        tx, ty = self.target
+
+        if dx > 0:
+            # the first wall after x, the jump ends before it
+            end = row.find(1, x + 1)
+            if end == -1:
+                end = self.width + 1
+
+            # first tile after x (and before end) with a wall before it and a tile at it
+            point = tx if ty == y and x < tx < end else end
+            for side in (above, below):
+                if side != None:
+                    forced = side.find(b"\x01\x00", x, point)
+                    if forced != -1:
+                        point = forced + 1
+
+            return (point, y) if point < end else None
+
+        else:
+            # the first wall before x
+            end = row.rfind(1, 0, x)
+
+            point = tx if ty == y and end < tx < x else end
+            for side in (above, below):
+                if side != None:
+                    forced = side.rfind(b"\x00\x01", point + 1, x + 1)
+                    if forced != -1:
+                        point = forced
+
+            return (point, y) if point > end else None
+
+    def jumpVertical(self, x, y, dy):
+        # moves from (x, y) in direction dy until it finds a jump point, returns it or None if it hit a wall first
+        isTile = self.isTile
+
+        while True:
+            y += dy
+
+            if not isTile(x, y):
+                return None
+
+            if (x, y) == self.target:
+                return (x, y)
+
+            if (isTile(x - 1, y) and not isTile(x - 1, y - dy)) or (isTile(x + 1, y) and not isTile(x + 1, y - dy)):
+                return (x, y)
+
+            # paths can only turn at jump points, so a tile from which a horizontal jump finds something is one too
+            if self.jumpHorizontal(x, y, 1) != None or self.jumpHorizontal(x, y, -1) != None:
+                return (x, y)
+
+    def jump(self, x, y, dx, dy):
+        if dx != 0:
+            return self.jumpHorizontal(x, y, dx)
+
+        return self.jumpVertical(x, y, dy)
+
+    def stepSearch(self):
+        current = self.chooseMinimum()
+
+        if current != None: # if the frontier was not empty
+            self.current = current
+            x, y = self.current
+
+            # check if we reached target
+            if (x, y) == self.target:
+                return 1
+
+            for dx, dy in self.getDirections(x, y):
+                point = self.jump(x, y, dx, dy)
+
+                if point == None or point in self.closed:
+                    continue
+
+                # jumps are straight lines, so their length is the manhattan distance
+                length = self.pathLength[self.current] + abs(point[0] - x) + abs(point[1] - y)
+
+                if length < self.pathLength.get(point, float('inf')):
+                    # the tiles jumped over are shown as seen, as they may end up on the path
+                    for tile in self.parents.between(self.current, point) + [point]:
+                        if tile not in self.seen:
+                            self.seen.add(tile)
+                            self.changes.seen.append(tile)
+
+                    self.parents.set(point, self.current)
+                    self.push(point, length)
+
+            return 0
+
+        else:
+            return -1
+
+    def push(self, tile, length):
+        self.pathLength[tile] = length
+
+        distance = self.manhattanDistance(tile)
+        heapq.heappush(self.frontier, (length + distance, distance, self.pushed, tile))
+        self.pushed += 1
+
+    def chooseMinimum(self):
+        # choose the jump point that has the least value of path lenght + manhattan distance
+        #       -> if there is a tie choose the node closest to the goal
+        # returns None when the frontier is empty
+
+        while self.frontier:
+            value, distance, _, tile = heapq.heappop(self.frontier)
+
+            # skip entries of tiles that were expanded already or that have been pushed again with a shorter path
+            if tile in self.closed or value - distance != self.pathLength[tile]:
+                continue
+
+            self.closed.add(tile)
+            return tile
+
+        return None
+
+    def manhattanDistance(self, node):
+        # returns the manhattan distance of a node to the target
+        w1, h1 = node
+        w2, h2 = self.target
+
+        return abs(w2 - w1) + abs(h2 - h1)
@@ -0,0 +1,262 @@
+import heapq
+from array import array
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+from util.Adjacency import Adjacency, RIGHT, DOWN, UP, LEFT
+
+# order the neighbors are looked at in
+ORDER = (LEFT, UP, DOWN, RIGHT)
+
+# lifelong planning a star (LPA*), an a star that keeps its search after it finishes
+#   - g[i] is the length of the path to i the search settled on, rhs[i] is the one its neighbors give it (1 + their best g)
+#   - a tile is consistent when both are the same, the frontier only holds the inconsistent ones
+#   - the first search is like an a star, but ties on g + h are broken by the smaller min(g, rhs) (breadth first)
+#     instead of the smaller h, which LPA* needs to be correct, so it can expand many more tiles than AStar does
+#   - when some walls change (see updateWalls) only the tiles next to them become inconsistent,
+#     and searching again only repairs the part of the search that depended on them instead of starting over
+#
+# every step expands one tile, and the last one (current is the target) returns 1 once the path to the target can't change
+
+class LPAStar:
+    def __init__(self, start, target, grid):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+        self.grid = grid # grid is an array where grid[y][x] tells you if it is a wall (true) or a tile (false)
+
+        self.width = len(self.grid[0]) - 1
+        self.height = len(self.grid) - 1
+
+        self.current = self.start
+
+        # the search itself works with cell ids (y * W + x) and the moves compiled from the walls, see util/Adjacency
+        #   -> the moves are copied since they are changed when the walls change
+        self.W = self.width + 1
+        self.H = self.height + 1
+        self.walls = bytearray(b"".join(bytes(row) for row in self.grid))
+        adjacency = Adjacency.fromGrid(self.grid)
+        self.moves = bytearray(adjacency.moves)
+        self.neighbors = adjacency.neighbors(ORDER)
+        self.root = self.index(self.start)
+        self.goal = self.index(self.target)
+
+        # no path is this long, it stands for infinity
+        self.INF = self.W * self.H
+
+        self.g = array('i', [self.INF]) * (self.W * self.H)
+        self.rhs = array('i', [self.INF]) * (self.W * self.H)
+
+        # bp[i] is the neighbor rhs[i] comes from, -1 if there is none
+        self.bp = array('i', [-1]) * (self.W * self.H)
+
+        # the path to every consistent tile, shown by the grid (see util/Changes)
+        #   - a tile only points to its neighbor once its g is settled, and stops pointing anywhere when it is taken back
+        self.parents = Parents(self.W, self.H)
+
+        # tiles seen by this run of the search, each repair starts with none
+        self.seen = Visited(self.W, self.H, [self.start])
+
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.start, self.W)
+
+        # heap of (min(g, rhs) + manhattan distance, min(g, rhs), order, cell id)
+        #   -> a tile is pushed again every time its key changes, old entries are skipped when they get to the top
+        self.pushed = 0
+        self.frontier = []
+
+        self.rhs[self.root] = 0
+        self.push(self.root)
+
+    def index(self, tile):
+        x, y = tile
+        return y * self.W + x
+
+    def getCurrent(self):
+        return self.current
+
+    def frontierSize(self):
+        # inconsistent tiles waiting to be expanded, entries in the heap, including the ones that will be skipped (see util/Metrics)
+        return len(self.frontier)
+
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def key(self, i):
+        m = min(self.g[i], self.rhs[i])
+        return (m + self.manhattanDistance(i), m)
+
+    def push(self, i):
+        k1, k2 = self.key(i)
+        heapq.heappush(self.frontier, (k1, k2, self.pushed, i))
+        self.pushed += 1
+
+        # walls can only be in the frontier to be taken out of the search, they are never shown as seen
+        if not self.seen.flags[i] and not self.walls[i]:
+            self.seen.addIndex(i)
+            self.changes.seen.append(i)
+
+    def settle(self, i):
+        # i is consistent, so the path to it is the one through bp[i]
+        if self.g[i] < self.INF:
+            self.parents.parent[i] = self.bp[i]
+            self.parents.depth[i] = self.g[i]
+        else:
+            self.parents.parent[i] = -1
+
+    def updateVertex(self, i):
+        # gets rhs[i] again from the neighbors, and puts i in the frontier if that made it inconsistent
+        if i != self.root:
+            g = self.g
+            best = self.INF
+            bp = -1
+
+            for offset in self.neighbors[self.moves[i]]:
+                if g[i + offset] + 1 < best:
+                    best = g[i + offset] + 1
+                    bp = i + offset
+
+            self.rhs[i] = best
+            self.bp[i] = bp
+
+        if self.g[i] != self.rhs[i]:
+            self.push(i)
+        else:
+            self.settle(i)
+
+    def chooseMinimum(self):
+        # returns the inconsistent tile with the smallest key, or None when there are none left
+        #   -> the top entry is left in the heap, so the search can stop before taking it
+        g = self.g
+        rhs = self.rhs
+
+        while self.frontier:
+            k1, k2, _, i = self.frontier[0]
+
+            if g[i] != rhs[i] and (k1, k2) == self.key(i):
+                return i
+
+            heapq.heappop(self.frontier)
+
+        return None
+
+    def stepSearch(self):
+        i = self.chooseMinimum()
+
+        # done once nothing in the frontier can change the path to the target
+        if self.g[self.goal] == self.rhs[self.goal] and (i == None or self.frontier[0][:2] >= self.key(self.goal)):
+            if self.g[self.goal] < self.INF:
+                self.current = self.target
+                return 1
+
+            if i == None:
+                return -1
+
+        if i == None:
+            return -1
+
+        heapq.heappop(self.frontier)
+
+        # a tile that just became a wall is taken out of the search without being the current node, it is not a tile
+        # of any path and the grid would paint over the wall
+        if not self.walls[i]:
+            self.current = (i % self.W, i // self.W)
+
+        g = self.g
+        rhs = self.rhs
+
+        if g[i] > rhs[i]:
+            # a shorter path to i was found, its neighbors may get a shorter one through it
+            g[i] = rhs[i]
+            self.settle(i)
+
+            length = g[i] + 1
+            for offset in self.neighbors[self.moves[i]]:
+                neighbor = i + offset
+
+                if neighbor != self.root and length < rhs[neighbor]:
+                    rhs[neighbor] = length
+                    self.bp[neighbor] = i
+
+                    if g[neighbor] != length:
+                        self.push(neighbor)
+                    else:
+                        self.settle(neighbor)
+        else:
+            # the path to i got longer or was cut, i and the neighbors that were reached through it are looked at again
+            g[i] = self.INF
+            self.updateVertex(i)
+
+            for offset in self.neighbors[self.moves[i]]:
+                if self.bp[i + offset] == i:
+                    self.updateVertex(i + offset)
+
+        return 0
+
+    def updateWalls(self, walls, changed):
+        # the tiles at the cell ids in changed became walls or stopped being walls, walls is the flat map after the change
+        # (see Board.getWalls), the next steps repair the search
+        #   - the parent table is copied first, the one of the last run may be kept by its trace (see util/Trace)
+        self.parents = self.parents.copy()
+        self.seen = Visited(self.W, self.H, [self.start])
+        self.changes = Changes(self.start, self.W)
+        self.current = self.start
+
+        touched = set()
+        for i in changed:
+            self.walls[i] = walls[i]
+            touched.add(i)
+            touched.update(self.around(i))
+
+        for i in touched:
+            self.compileMoves(i)
+
+        for i in touched:
+            self.updateVertex(i)
+
+    def around(self, i):
+        # cell ids of the tiles next to i, walls included
+        x, y = i % self.W, i // self.W
+
+        tiles = []
+        if x + 1 < self.W:
+            tiles.append(i + 1)
+        if y + 1 < self.H:
+            tiles.append(i + self.W)
+        if y > 0:
+            tiles.append(i - self.W)
+        if x > 0:
+            tiles.append(i - 1)
+
+        return tiles
+
+    def compileMoves(self, i):
+        # same as util/Adjacency for a single tile
+        moves = 0
+
+        if not self.walls[i]:
+            x, y = i % self.W, i // self.W
+            walls = self.walls
+
+            if x + 1 < self.W and not walls[i + 1]:
+                moves |= RIGHT
+            if y + 1 < self.H and not walls[i + self.W]:
+                moves |= DOWN
+            if y > 0 and not walls[i - self.W]:
+                moves |= UP
+            if x > 0 and not walls[i - 1]:
+                moves |= LEFT
+
+        self.moves[i] = moves
+
+    def manhattanDistance(self, node):
+        # returns the manhattan distance of a node (cell id) to the target
+        w1, h1 = node % self.W, node // self.W
+        w2, h2 = self.target
+
+        return abs(w2 - w1) + abs(h2 - h1)
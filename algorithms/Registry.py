@@ -0,0 +1,152 @@
+from importlib import import_module
+from importlib.util import find_spec
+import warnings
+
+# every algorithm the visualizer, solve.py and bench.py know about, without importing any of them
+#   - an Algorithm only says where its class is ("module:Class"), the module is imported the first time it is created
+#   - the buttons of the visualizer and the names solve.py takes are made from this list, in this order
+#   - other packages can add algorithms with an entry point in the group GROUP that points to an Algorithm
+#     (or a list of them), for example in their pyproject.toml:
+#
+#         [project.entry-points."graph_traversal.algorithms"]
+#         flood = "flood.plugin:ALGORITHM"
+#
+#     where flood/plugin.py only has ALGORITHM = Algorithm("flood", "Flood Fill", "flood.engine:FloodFill")
+#     the entry points are only looked at when an algorithm that is not built in is asked for, or when all of them are,
+#     and only the Algorithm they declare is loaded then, its module is imported (and checked) when it is first created
+#     like the built in ones, one that fails is not offered anymore (see available)
+#
+# the class of an algorithm is made with (start, target, grid), or (start, target, grid, costs) when it is weighted,
+# and is stepped like the ones in this folder (see INTERFACE)
+
+GROUP = "graph_traversal.algorithms"
+
+# methods the class of every algorithm has to have
+#   - stepSearch() -> 0 while searching, 1 when it found the target, -1 when there is nothing left to explore
+#   - getCurrent() -> the node it is at
+#   - getChanges() -> what changed since the last call (see util/Changes)
+#   - frontierSize() -> nodes waiting to be expanded (see util/Metrics)
+# and its instances have to have the attributes path (the tiles that lead to the current node, a property or set in
+# __init__ and kept up to date), start, target, current, parents and changes, which util/Trace uses to record it
+INTERFACE = ("stepSearch", "getCurrent", "getChanges", "frontierSize")
+
+# incremental algorithms can also be told which walls changed after they finished, see algorithms/LPAStar
+INCREMENTAL = ("updateWalls",)
+
+class Algorithm:
+    def __init__(self, name, label, source, weighted = False, incremental = False, requires = (), expands = "tiles"):
+        self.name = name # name in solve.py and bench.py
+        self.label = label # text of its button
+        self.source = source # "module:Class"
+
+        # capabilities
+        #   - weighted -> it takes the costs of the terrain and finds the cheapest path with them
+        #   - incremental -> it can be kept after it finishes and repair its search when walls change
+        #   - requires -> modules that have to be installed for it to be offered
+        #   - expands -> what a step takes out of the frontier, so the steps of different algorithms can be compared
+        self.weighted = weighted
+        self.incremental = incremental
+        self.requires = requires
+        self.expands = expands
+
+        self.cls = None # only imported when it is first created
+        self.error = None # why it couldn't be loaded, it is not tried again
+
+    def available(self):
+        # looks for the required modules without importing them
+        return self.error == None and all(find_spec(module) != None for module in self.requires)
+
+    def load(self):
+        # the class, imported and checked the first time
+        #   -> raises ImportError, AttributeError or TypeError (missing some of the INTERFACE) if it can't be used
+        if self.error != None:
+            raise self.error
+
+        if self.cls == None:
+            try:
+                module, name = self.source.split(":")
+                cls = getattr(import_module(module), name)
+
+                missing = [member for member in INTERFACE + (INCREMENTAL if self.incremental else ()) if not callable(getattr(cls, member, None))]
+                if missing:
+                    raise TypeError(self.source + " is missing " + ", ".join(missing))
+
+            except Exception as error:
+                self.error = error
+                raise
+
+            self.cls = cls
+
+        return self.cls
+
+    def create(self, start, target, grid, costs = None):
+        # costs[y][x] is what moving onto (x, y) costs, it is only given to weighted algorithms
+        if self.weighted and costs != None:
+            return self.load()(start, target, grid, costs)
+
+        return self.load()(start, target, grid)
+
+BUILT_IN = [
+    Algorithm("dfs", "Depth FS", "algorithms.DFS:DFS"),
+    Algorithm("bfs", "Breadth FS", "algorithms.BFS:BFS"),
+    Algorithm("gfs", "Greedy FS", "algorithms.GFS:GFS"),
+    Algorithm("astar", "A-Star", "algorithms.AStar:AStar"),
+    Algorithm("jps", "Jump Point", "algorithms.JPS:JPS", expands = "jump points"),
+    Algorithm("bibfs", "Bi BFS", "algorithms.BiBFS:BiBFS"),
+    Algorithm("biastar", "Bi A-Star", "algorithms.BiAStar:BiAStar"),
+    Algorithm("lpastar", "LPA-Star", "algorithms.LPAStar:LPAStar", incremental = True),
+    Algorithm("dijkstra", "Dijkstra", "algorithms.Dijkstra:Dijkstra", weighted = True),
+    Algorithm("wastar", "Weighted A-Star", "algorithms.WeightedAStar:WeightedAStar", weighted = True),
+    Algorithm("wave", "Wave BFS", "algorithms.WaveBFS:WaveBFS", requires = ("numpy",), expands = "layers"),
+]
+
+# by name, the built in ones first and then the ones added by register or by entry points
+registry = {algorithm.name : algorithm for algorithm in BUILT_IN}
+pluginsLoaded = False
+
+def register(algorithm):
+    # adds an algorithm (or replaces the one with the same name)
+    registry[algorithm.name] = algorithm
+
+def loadPlugins():
+    # adds the algorithms of the entry points, once, a plugin that fails to load or doesn't declare an Algorithm is
+    # skipped with a warning
+    #   -> only the module of the entry point is imported, not the one of the class (see Algorithm.load)
+    global pluginsLoaded
+    if pluginsLoaded:
+        return
+
+    pluginsLoaded = True
+
+    from importlib.metadata import entry_points # slow to import, and only needed here
+
+    for entryPoint in entry_points(group = GROUP):
+        try:
+            declared = entryPoint.load()
+        except Exception as error:
+            warnings.warn("could not load the algorithm plugin " + entryPoint.name + ": " + str(error))
+            continue
+
+        for algorithm in (declared if isinstance(declared, (list, tuple)) else [declared]):
+            if not isinstance(algorithm, Algorithm) or len(algorithm.source.split(":")) != 2:
+                warnings.warn("the algorithm plugin " + entryPoint.name + " is not an Algorithm with a \"module:Class\" source")
+                continue
+
+            # the built in ones can't be replaced by a plugin
+            registry.setdefault(algorithm.name, algorithm)
+
+def find(name):
+    # the algorithm called name, or None
+    if name not in registry:
+        loadPlugins()
+
+    return registry.get(name)
+
+def algorithms(available = True):
+    # every algorithm, only the ones that can be used unless available is False
+    loadPlugins()
+
+    return [algorithm for algorithm in registry.values() if algorithm.available() or not available]
+
+def names(available = True):
+    return [algorithm.name for algorithm in algorithms(available)]
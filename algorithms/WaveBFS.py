@@ -0,0 +1,161 @@
+import numpy as np
+
+from util.Parents import Parents
+from util.Changes import Changes
+
+# breadth first search that moves a whole layer (all tiles at the same distance) at a time using numpy
+#   - every tile is a flat index y * width + x, moving is adding -1, +1, -width or +width to the whole frontier at once
+#   - instead of a queue of nodes it keeps the distance of every tile from the start (-1 if it was not reached)
+#   - each step is one layer, so the animation shows the wave growing from the origin
+
+class WaveBFS:
+    def __init__(self, start, target, grid):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+
+        self.width = len(grid[0]) - 1
+        self.height = len(grid) - 1
+
+        self.W = self.width + 1 # number of columns, used for the flat indices
+        self.N = self.W * (self.height + 1)
+
+        # grid[y][x] tells you if it is a wall (true) or a tile (false)
+        walls = np.frombuffer(b"".join(bytes(row) for row in grid), dtype = np.uint8)
+        self.free = walls == 0
+
+        # distance[y * W + x] is the length of the shortest path from start to (x, y), -1 if it was not reached
+        self.distance = np.full(self.N, -1, dtype = np.int32)
+
+        s = self.index(start)
+        self.distance[s] = 0
+
+        self.layer = 0
+        self.frontier = np.array([s], dtype = np.int64)
+
+        self.current = self.start
+
+        # only the final path is stored, once the target is reached
+        self.parents = Parents(self.W, self.height + 1)
+
+        # what changed since the grid last drew the search
+        self.changes = LayerChanges(self.start, self)
+        self.layers = [] # layers that were not turned into changes yet
+
+        self.found = self.start == self.target
+
+    def index(self, tile):
+        x, y = tile
+        return y * self.W + x
+
+    def getCurrent(self):
+        # there is no current node, the start is shown until the target is found
+        return self.current
+
+    def frontierSize(self):
+        # nodes waiting to be expanded, tiles in the current layer (see util/Metrics)
+        return int(self.frontier.size)
+
+    @property
+    def seen(self):
+        return [(i % self.W, i // self.W) for i in np.flatnonzero(self.distance >= 0).tolist()]
+
+    @property
+    def path(self):
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def stepSearch(self):
+        if self.found:
+            self.current = self.target
+            self.storePath()
+            return 1
+
+        if self.frontier.size == 0:
+            return -1
+
+        f = self.frontier
+        W = self.W
+        column = f % W
+
+        # every neighbor of every tile in the frontier, as long as it is in bounds
+        neighbors = np.concatenate((
+            f[column != W - 1] + 1,
+            f[f < self.N - W] + W,
+            f[f >= W] - W,
+            f[column != 0] - 1,
+            ))
+
+        # keep the ones that are not walls and have not been reached before
+        neighbors = neighbors[self.free[neighbors] & (self.distance[neighbors] == -1)]
+        neighbors = np.unique(neighbors)
+
+        self.layer += 1
+        self.distance[neighbors] = self.layer
+        self.frontier = neighbors
+        self.layers.append(neighbors.astype(np.int32))
+
+        if self.distance[self.index(self.target)] != -1:
+            self.found = True
+
+        return 0
+
+    def storePath(self):
+        # walks back from the target to the start, always moving to a tile one closer to the start
+        W = self.W
+        distance = self.distance
+
+        i = self.index(self.target)
+        while distance[i] > 0:
+            d = distance[i] - 1
+            x = i % W
+
+            if x + 1 < W and distance[i + 1] == d:
+                parent = i + 1
+            elif i + W < self.N and distance[i + W] == d:
+                parent = i + W
+            elif i - W >= 0 and distance[i - W] == d:
+                parent = i - W
+            else:
+                parent = i - 1
+
+            self.parents.set((i % W, i // W), (parent % W, parent // W))
+            i = parent
+
+    def solve(self):
+        # runs until the end, returns (distance, path)
+        #   - distance[y][x] is the length of the shortest path from start to (x, y), -1 if it can't be reached
+        #   - path goes from start to target (both included), empty if there is none
+        status = 0
+        while status == 0:
+            status = self.stepSearch()
+
+        self.layers = []
+
+        path = self.path + [self.target] if status == 1 else []
+
+        return (self.distance.reshape(self.height + 1, self.W), path)
+
+class LayerChanges(Changes):
+    # the layers are kept as numpy arrays and only turned into tiles when the changes are taken
+    def __init__(self, current, search):
+        Changes.__init__(self, current)
+        self.search = search
+
+    def flush(self):
+        W = self.search.W
+
+        for layer in self.search.layers:
+            self.seen.extend((i % W, i // W) for i in layer.tolist())
+
+        self.search.layers = []
+
+    def take(self, current, parents):
+        self.flush()
+        return Changes.take(self, current, parents)
+
+    def takeSeen(self):
+        self.flush()
+        return Changes.takeSeen(self)
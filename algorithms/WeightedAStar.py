@@ -0,0 +1,141 @@
+from array import array
+from itertools import chain
+from util.Parents import Parents
+from util.Changes import Changes
+from util.Visited import Visited
+from util.BucketQueue import makeQueue
+from util.Adjacency import Adjacency, RIGHT, DOWN, UP, LEFT
+
+# order the neighbors are pushed in
+ORDER = (LEFT, UP, DOWN, RIGHT)
+
+# a star search on a map where tiles can cost more than 1 to move onto (terrain)
+#   - the heuristic is the manhattan distance times the cheapest cost, so it never overestimates
+#   - the costs are small integers, so the frontier is a bucket queue instead of a heap (see util/BucketQueue)
+#     and a whole search takes time linear in the tiles it sees plus the biggest cost
+
+class WeightedAStar:
+    def __init__(self, start, target, grid, costs = None):
+        self.start = start # start is a tuple (x, y)
+        self.target = target
+        self.grid = grid # grid is an array where grid[y][x] tells you if it is a wall (true) or a tile (false)
+
+        self.width = len(self.grid[0]) - 1
+        self.height = len(self.grid) - 1
+
+        self.current = self.start
+
+        # the search itself works with cell ids (y * W + x) and the moves compiled from the walls, see util/Adjacency
+        self.W = self.width + 1
+        self.adjacency = Adjacency.fromGrid(self.grid)
+        self.neighbors = self.adjacency.neighbors(ORDER)
+        self.goal = self.index(self.target)
+
+        # costs[y][x] is what moving onto (x, y) costs (a positive integer), every move costs 1 without them
+        if costs == None:
+            self.cost = array('i', [1]) * (self.W * (self.height + 1))
+        else:
+            self.cost = array('i', chain.from_iterable(costs))
+
+        self.minCost = min(self.cost)
+
+        # seen tells you if (x, y) has been seen before, seen.flags[y * W + x] is 1 if it has (see util/Visited)
+        self.seen = Visited(self.W, self.height + 1, [self.start])
+
+        # keeps track of the tile each seen tile was reached from, the path to the current node is rebuilt from it
+        self.parents = Parents(self.width + 1, self.height + 1)
+
+        # what changed since the grid last drew the search
+        self.changes = Changes(self.start, self.W)
+
+        # cost of the cheapest path found so far to each tile, -1 for the ones not seen yet
+        self.pathCost = array('i', [-1]) * (self.W * (self.height + 1))
+        self.pathCost[self.index(self.start)] = 0
+
+        # tiles that have already been expanded, their path cost can't improve anymore
+        self.closed = Visited(self.W, self.height + 1)
+
+        # frontier of cell ids by path cost + heuristic
+        #   -> from a tile to its neighbor that goes up by its cost plus or minus minCost, and never down
+        #   -> a tile is pushed again when a cheaper path to it is found, the old entry is skipped when popped
+        self.frontier = makeQueue(max(self.cost) + self.minCost + 1)
+        self.frontier.push(self.heuristic(self.index(self.start)), self.index(self.start))
+
+    def index(self, tile):
+        x, y = tile
+        return y * self.W + x
+
+    def getCurrent(self):
+        return self.current
+
+    def frontierSize(self):
+        # nodes waiting to be expanded, including the entries that will be skipped (see util/Metrics)
+        return len(self.frontier)
+
+    @property
+    def path(self):
+        # path to the current node, only built when it is asked for
+        return self.parents.getPath(self.current)
+
+    def getChanges(self):
+        # (seen, previous, current, removed, added) since the last call, see util/Changes
+        return self.changes.take(self.current, self.parents)
+
+    def stepSearch(self):
+        i = self.chooseMinimum()
+
+        if i != None: # if the frontier was not empty
+            self.current = (i % self.W, i // self.W)
+
+            # check if we reached target
+            if i == self.goal:
+                return 1
+
+            closed = self.closed.flags
+            seen = self.seen.flags
+            cost = self.cost
+            pathCost = self.pathCost
+            base = pathCost[i]
+
+            # add to the frontier the neighbors that were not seen or that were reached by a more expensive path
+            for offset in self.neighbors[self.adjacency.moves[i]]:
+                neighbor = i + offset
+
+                if closed[neighbor]:
+                    continue
+
+                total = base + cost[neighbor]
+                if pathCost[neighbor] == -1 or total < pathCost[neighbor]:
+                    if not seen[neighbor]:
+                        self.seen.addIndex(neighbor)
+                        self.changes.seen.append(neighbor)
+
+                    pathCost[neighbor] = total
+                    self.parents.setIndex(neighbor, i)
+                    self.frontier.push(total + self.heuristic(neighbor), neighbor)
+
+            return 0
+
+        else:
+            return -1
+
+    def chooseMinimum(self):
+        # the tile with the smallest path cost + heuristic, None when the frontier is empty
+        #   -> entries of tiles already expanded were pushed before a cheaper path was found, they are skipped
+        closed = self.closed.flags
+
+        while self.frontier:
+            _, i = self.frontier.pop()
+
+            if not closed[i]:
+                self.closed.addIndex(i)
+                return i
+
+        return None
+
+    def heuristic(self, node):
+        # manhattan distance of a node (cell id) to the target, times the cheapest cost
+        w1, h1 = node % self.W, node // self.W
+        w2, h2 = self.target
+
+        return (abs(w2 - w1) + abs(h2 - h1)) * self.minCost
@@ -0,0 +1,204 @@
+# reproducible benchmarks for the algorithms and the maze generator, without opening a window
+#   - python bench.py -o results.json
+#   - python bench.py --sizes 40x24,2000x2000 --layouts maze --algos bfs,astar
+#   - python bench.py -o new.json --compare old.json -> prints how much every case changed
+#   - python bench.py --layouts terrain --algos bfs,dijkstra,wastar -> open layouts where tiles cost 1 to 9
+#
+# every case is run on a grid built from a fixed seed, so two runs (or two commits) solve exactly the same maps
+
+from solve import solve
+from algorithms import Registry
+from util.Maze import Maze
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+SIZES = "40x24,100x100,300x300"
+DENSITIES = "0,0.2,0.3"
+LAYOUTS = "open,maze"
+N_SOLUTIONS = 4
+
+def openGrid(width, height, density, seed):
+    # random walls, each tile is a wall with probability density (origin and target are always tiles)
+    rand = random.Random(seed)
+    grid = [bytearray(rand.random() < density for _ in range(width)) for _ in range(height)]
+
+    grid[0][0] = 0
+    grid[height - 1][width - 1] = 0
+
+    return grid
+
+def terrainCosts(width, height, seed):
+    # random cost from 1 to 9 for every tile
+    rand = random.Random(seed + 1)
+    return [bytes(rand.randint(1, 9) for _ in range(width)) for _ in range(height)]
+
+def mazeGrid(width, height, seed):
+    return Maze(width, height, (0, 0), (width - 1, height - 1), seed).createMaze(N_SOLUTIONS)
+
+def measure(function, memory, repeat):
+    # returns (result, seconds, peak bytes allocated or None)
+    #   - seconds is the fastest of repeat runs, the others are mostly noise from the rest of the machine
+    #   - time and memory are measured in separate runs, tracemalloc slows everything down
+    seconds = float('inf')
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return (result, seconds, peak)
+
+def benchMaze(width, height, seed, memory, repeat):
+    _, seconds, peak = measure(lambda: mazeGrid(width, height, seed), memory, repeat)
+
+    return {
+        "case" : "maze/%dx%d" % (width, height),
+        "width" : width,
+        "height" : height,
+        "seed" : seed,
+        "seconds" : seconds,
+        "peakBytes" : peak,
+    }
+
+def benchSolve(algorithm, layout, density, grid, seed, memory, repeat, costs = None):
+    width = len(grid[0])
+    height = len(grid)
+
+    solution, seconds, peak = measure(lambda: solve(grid, (0, 0), (width - 1, height - 1), algorithm, None, costs), memory, repeat)
+
+    return {
+        "case" : "%s/%s/%dx%d" % (algorithm, layout if layout == "maze" else layout + "-" + str(density), width, height),
+        "algorithm" : algorithm,
+        "layout" : layout,
+        "density" : density,
+        "width" : width,
+        "height" : height,
+        "seed" : seed,
+        "found" : solution.found(),
+        "cost" : solution.cost,
+        "expanded" : solution.expanded,
+        "searchSeconds" : solution.seconds,
+        "seconds" : seconds, # end to end, building the algorithm included
+        "stepsPerSecond" : solution.expanded / solution.seconds if solution.seconds else None,
+        "peakBytes" : peak,
+    }
+
+def run(sizes, densities, layouts, algorithms, seed, memory, repeat, log):
+    results = []
+
+    for width, height in sizes:
+        if "maze" in layouts:
+            results.append(benchMaze(width, height, seed, memory, repeat))
+            log(results[-1])
+
+        grids = []
+        if "open" in layouts:
+            grids += [("open", density, openGrid(width, height, density, seed), None) for density in densities]
+        if "terrain" in layouts:
+            costs = terrainCosts(width, height, seed)
+            grids += [("terrain", density, openGrid(width, height, density, seed), costs) for density in densities]
+        if "maze" in layouts:
+            grids.append(("maze", None, mazeGrid(width, height, seed), None))
+
+        for layout, density, grid, costs in grids:
+            for algorithm in algorithms:
+                results.append(benchSolve(algorithm, layout, density, grid, seed, memory, repeat, costs))
+                log(results[-1])
+
+    return results
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output = True, text = True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(old, new, threshold):
+    # prints every case in both results, returns the cases that got slower than threshold times
+    oldCases = {result["case"] : result for result in old["results"]}
+    regressions = []
+
+    print("%-36s %12s %12s %8s" % ("case", "old (s)", "new (s)", "ratio"))
+
+    for result in new["results"]:
+        before = oldCases.get(result["case"])
+        if before == None or not before["seconds"]:
+            continue
+
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(result["case"])
+            flag = "  <- slower"
+
+        print("%-36s %12.6f %12.6f %8.2f%s" % (result["case"], before["seconds"], result["seconds"], ratio, flag))
+
+    return regressions
+
+def parseSizes(text):
+    return [tuple(int(n) for n in size.split("x")) for size in text.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the algorithms and the maze generator.")
+    parser.add_argument("--sizes", default = SIZES, help = "comma separated WIDTHxHEIGHT, default " + SIZES)
+    parser.add_argument("--densities", default = DENSITIES, help = "wall densities of the open layouts, default " + DENSITIES)
+    parser.add_argument("--layouts", default = LAYOUTS, help = "open, terrain and / or maze, default " + LAYOUTS)
+    parser.add_argument("--algos", help = "default every algorithm (see algorithms/Registry)")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--repeat", type = int, default = 3, help = "runs per case, the fastest one is kept")
+    parser.add_argument("--no-memory", action = "store_true", help = "skip the (slower) tracemalloc runs")
+    parser.add_argument("-o", "--output", help = "write the results as json to this file")
+    parser.add_argument("--compare", help = "json results of a previous run to compare against")
+    parser.add_argument("--threshold", type = float, default = 1.1, help = "ratio above which a case counts as slower")
+    args = parser.parse_args()
+
+    def log(result):
+        print("%-36s %10.6f s" % (result["case"], result["seconds"]), flush = True)
+
+    results = {
+        "meta" : {
+            "commit" : commit(),
+            "python" : platform.python_version(),
+            "platform" : platform.platform(),
+            "date" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed" : args.seed,
+        },
+        "results" : run(
+            parseSizes(args.sizes),
+            [float(density) for density in args.densities.split(",")],
+            args.layouts.split(","),
+            args.algos.split(",") if args.algos else Registry.names(),
+            args.seed,
+            not args.no_memory,
+            args.repeat,
+            log,
+            ),
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent = 2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+
+        print()
+        if compare(old, results, args.threshold):
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
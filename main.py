@@ -1,18 +1,24 @@
 import pygame
 from Grid import Grid
 from math import floor
+import time
 
-pygame.init()
-
-# nothing is hard-coded so that you can change the tile_W (as long as it is a divisor of width and height)
+# nothing is hard-coded so that you can change the tile_W (the size of the tiles before zooming in or out)
 WIDTH = 1000
 HEIGHT = 600
 MENU_HEIGHT = 200
 TILE_W = 25
+
+# size of the board in tiles, it doesn't have to fit in the window since it can be zoomed and moved around
+BOARD_WIDTH = WIDTH // TILE_W
+BOARD_HEIGHT = HEIGHT // TILE_W
 LINE_WIDTH = 1 # should be an odd number so that it all lines up 
 RECT_OFF = floor(LINE_WIDTH / 2) # offset due to the line's width
 TEXT_SIZE = 42
 FPS_SOLVE = 15
+DIRTY_RECTS = True # only draw the tiles that changed each frame instead of the whole screen
+METRICS = False # show the step counters and frame timings from the start (they can also be turned on with M)
+PREVIEW = False # show the shortest path while dragging the origin or the target (it can also be turned on with P)
 
 # color palette -> depends on tiles state
 colorPalette = {
@@ -23,14 +29,17 @@ colorPalette = {
     "DARKBLUE" : (10, 16, 69), # wall
     "RED" : (238, 99, 82),     # target
     "GREEN" : (21, 97, 109),   # origin
+    "BROWN" : (120, 92, 60),   # terrain, the heavier a tile the closer to this
 }
 
 
-screen = pygame.display.set_mode([WIDTH, HEIGHT + MENU_HEIGHT])
-pygame.display.set_caption('Graph Traversal Algorithms Visualizer')
-clock = pygame.time.Clock()
-
 def main():    
+    pygame.init()
+    
+    screen = pygame.display.set_mode([WIDTH, HEIGHT + MENU_HEIGHT])
+    pygame.display.set_caption('Graph Traversal Algorithms Visualizer')
+    clock = pygame.time.Clock()
+    
     # Run until the user asks to quit
     running = True
     
@@ -42,7 +51,8 @@ def main():
 
     gameState = "draw"
 
-    grid = Grid(WIDTH, HEIGHT, TILE_W, colorPalette, LINE_WIDTH, MENU_HEIGHT, TEXT_SIZE)
+    grid = Grid(WIDTH, HEIGHT, TILE_W, colorPalette, LINE_WIDTH, MENU_HEIGHT, TEXT_SIZE, metrics = METRICS, 
+                boardSize = (BOARD_WIDTH, BOARD_HEIGHT), preview = PREVIEW)
     
     while running:
         # click game while solving so algorithms can be visualized
@@ -62,27 +72,52 @@ def main():
                 elif event.key == pygame.K_SPACE and gameState == "draw":
                     gameState = "solve"
                     grid.defineAlgorithm()
+                else:
+                    gameState = grid.keyDown(event.key, gameState)
 
-            # mouse was clicked
+            # mouse was clicked -> 1 is the left button, 2 the middle one and 3 the right one
             if event.type == pygame.MOUSEBUTTONDOWN:
-                left, _, _ = pygame.mouse.get_pressed()
-                grid.clickDown(*pygame.mouse.get_pos(), left, gameState)
+                if event.button == 2:
+                    grid.startPan(*event.pos)
+                elif event.button in (1, 3):
+                    grid.clickDown(*event.pos, event.button == 1, gameState)
+            
+            if event.type == pygame.MOUSEWHEEL:
+                grid.zoom(event.y)
             
             if event.type == pygame.MOUSEBUTTONUP:
                     grid.clickUp()
                 
         #           U P D A T E
+        start = time.perf_counter()
+        
         grid.update(gameState)   
         if grid.solved:
             gameState = "draw"
         
+        updated = time.perf_counter()
+        
         #            D R A W  
-        screen.fill(colorPalette["GRAY"]) # background
-        grid.draw(screen)
+        if DIRTY_RECTS:
+            # update only the parts of the display that changed
+            rects = grid.drawChanges(screen)
+            drawn = time.perf_counter()
+            
+            pygame.display.update(rects)
         
-        # update the display
-        pygame.display.flip()
+        else:
+            screen.fill(colorPalette["GRAY"]) # background
+            grid.draw(screen)
+            drawn = time.perf_counter()
+            
+            # update the display
+            pygame.display.flip()
+        
+        grid.recordFrame(updated - start, drawn - updated, time.perf_counter() - drawn)
 
+    grid.quit()
     pygame.quit()
-             
-main() 
\ No newline at end of file
+
+# the race mode starts worker processes, which import this file again without running it
+if __name__ == "__main__":
+    main()
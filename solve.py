@@ -0,0 +1,176 @@
+# solves maps to completion without opening a window, so it can run in batch jobs on servers without a display
+#   - command line -> python solve.py map.txt --algo astar
+#   - python -> from solve import solve
+# nothing in here imports pygame
+
+from algorithms import Registry
+
+from util.MapFile import load
+from util.Trace import Trace
+from util.Metrics import Metrics
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import time
+
+# algorithms compared by a race
+RACE = ["dfs", "bfs", "gfs", "astar"]
+
+class Solution:
+    def __init__(self, algorithm, path, expanded, seconds, costs = None):
+        self.algorithm = algorithm
+        self.path = path # list of tiles from origin to target (both included), empty if there is no path
+        
+        # every move costs 1, or what the tile it moves onto costs (costs[y][x]) on maps with terrain
+        if not path:
+            self.cost = None
+        elif costs == None:
+            self.cost = len(path) - 1
+        else:
+            self.cost = sum(costs[y][x] for x, y in path[1:])
+        
+        self.expanded = expanded # number of nodes taken out of the frontier
+        self.seconds = seconds # wall-clock time of the search
+        
+    def found(self):
+        return bool(self.path)
+    
+    def toDict(self):
+        return {
+            "algorithm" : self.algorithm,
+            "found" : self.found(),
+            "cost" : self.cost,
+            "expanded" : self.expanded,
+            "seconds" : self.seconds,
+            "path" : self.path,
+        }
+
+def createSearch(algorithm, origin, target, grid, costs = None):
+    # the algorithms are looked up by name in algorithms/Registry, their module is only imported the first time
+    spec = Registry.find(algorithm)
+    if spec == None:
+        raise ValueError("unknown algorithm " + algorithm)
+    
+    return spec.create(origin, target, grid, costs)
+
+def solve(grid, origin, target, algorithm = "astar", metrics = None, costs = None):
+    # grid[y][x] tells you if it is a wall (truthy) or a tile, origin and target are (x, y) tuples
+    #   - metrics (see util/Metrics) also records the frontier size and time of every step, which slows the search down
+    #   - costs[y][x] is what moving onto (x, y) costs, only the weighted algorithms look for the cheapest path with them
+    #     but the cost of the solution is always added up with them
+    search = createSearch(algorithm, origin, target, grid, costs)
+    
+    start = time.perf_counter()
+    
+    if metrics == None:
+        expanded = 0
+        status = 0
+        
+        # 0 -> still searching, 1 -> found the target, -1 -> nothing left to explore
+        while status == 0:
+            status = search.stepSearch()
+            if status != -1:
+                expanded += 1
+    
+    else:
+        status, expanded = profileSteps(search, algorithm, metrics)
+            
+    seconds = time.perf_counter() - start
+    
+    path = search.path + [search.getCurrent()] if status == 1 else []
+    
+    if metrics != None:
+        metrics.endSolve(status, len(path) - 1 if path else None)
+    
+    return Solution(algorithm, path, expanded, seconds, costs)
+
+def profileSteps(search, algorithm, metrics):
+    # same loop as solve, recording every step in metrics, returns (status, expanded)
+    metrics.startSolve(algorithm)
+    
+    expanded = 0
+    status = 0
+    
+    while status == 0:
+        start = time.perf_counter()
+        status = search.stepSearch()
+        
+        if status != -1:
+            metrics.step(search.frontierSize(), time.perf_counter() - start)
+            expanded += 1
+    
+    return (status, expanded)
+
+def solveFile(path, algorithm = "astar", metrics = None):
+    return solve(*load(path), algorithm, metrics)
+
+def solveTraced(grid, origin, target, algorithm = "astar"):
+    # same as solve, but every step is recorded so it can be replayed, returns (solution, trace)
+    #   - the time includes recording the steps
+    search = createSearch(algorithm, origin, target, grid)
+    
+    start = time.perf_counter()
+    trace = Trace.record(search, bytes(b for row in grid for b in row), algorithm)
+    seconds = time.perf_counter() - start
+    
+    return (Solution(algorithm, trace.getPath(), trace.steps, seconds), trace)
+
+def race(grid, origin, target, algorithms = RACE):
+    # solves the same map with every algorithm at the same time, each one in its own process
+    # returns the solutions in the same order as algorithms, it takes as long as the slowest one
+    with ProcessPoolExecutor(max_workers = len(algorithms)) as pool:
+        futures = [pool.submit(solve, grid, origin, target, algorithm) for algorithm in algorithms]
+        
+        return [future.result() for future in futures]
+
+def printTable(solutions):
+    print("%-10s %6s %10s %10s %12s" % ("algorithm", "found", "cost", "expanded", "time (s)"))
+    
+    for solution in solutions:
+        print("%-10s %6s %10s %10d %12.6f" % (solution.algorithm, solution.found(), solution.cost, solution.expanded, solution.seconds))
+
+def main():
+    parser = argparse.ArgumentParser(description = "Solve a map without opening the visualizer.")
+    parser.add_argument("map", help = "binary map (.gtm) or text map, '#' are walls, 'O' is the origin and 'T' the target")
+    parser.add_argument("--algo", default = "astar", help = "one of " + ", ".join(algorithm.name for algorithm in Registry.BUILT_IN)
+                        + " or the name of an algorithm added by a plugin, default astar")
+    parser.add_argument("--json", action = "store_true", help = "print the result as json, path included")
+    parser.add_argument("--race", nargs = "?", const = ",".join(RACE), metavar = "ALGOS",
+                        help = "solve with several algorithms at the same time (default " + ",".join(RACE) + ") and compare them")
+    parser.add_argument("--profile", metavar = "FILE",
+                        help = "save the frontier size and time of every step to FILE (.json or .csv)")
+    args = parser.parse_args()
+    
+    # only looks for plugins if a name is not built in (see algorithms/Registry)
+    for name in (args.race.split(",") if args.race else [args.algo]):
+        if Registry.find(name) == None:
+            parser.error("unknown algorithm " + name)
+    
+    if args.race:
+        solutions = race(*load(args.map), args.race.split(","))
+        
+        if args.json:
+            print(json.dumps([solution.toDict() for solution in solutions]))
+        else:
+            printTable(solutions)
+            
+        return
+    
+    metrics = Metrics() if args.profile else None
+    solution = solveFile(args.map, args.algo, metrics)
+    
+    if metrics != None:
+        metrics.save(args.profile)
+    
+    if args.json:
+        print(json.dumps(solution.toDict()))
+    else:
+        print("algorithm: " + solution.algorithm)
+        print("found:     " + str(solution.found()))
+        print("cost:      " + str(solution.cost))
+        print("expanded:  " + str(solution.expanded))
+        print("time:      %.6f s" % solution.seconds)
+    
+if __name__ == "__main__":
+    main()
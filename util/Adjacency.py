@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+# the moves that can be made from every tile, compiled once from the walls so the searches don't have to check them
+#   - every tile is a cell id -> y * width + x
+#   - moves[i] is a bitmask of the directions (RIGHT, DOWN, UP, LEFT) that lead from i to a tile that is not a wall
+#   - moving is adding the offset of the direction to the cell id
+#
+# it is built for the whole board at once by treating the board as one big integer with one byte per tile:
+# shifting it by 8 bits moves every tile one column, shifting it by 8 * width bits moves every tile one row
+
+RIGHT = 1
+DOWN = 2
+UP = 4
+LEFT = 8
+
+DIRECTIONS = (RIGHT, DOWN, UP, LEFT)
+
+# walls (anything but 0) become 0 and tiles become 1
+FREE = bytes([1]) + bytes(255)
+
+# the last few boards that were compiled, so solving the same walls again skips building them
+CACHE_SIZE = 4
+cache = OrderedDict()
+
+class Adjacency:
+    def __init__(self, walls, width, height):
+        # walls is a flat bytes-like object where anything but 0 is a wall (see Board.getWalls)
+        self.width = width
+        self.height = height
+
+        n = width * height
+        free = int.from_bytes(bytes(walls).translate(FREE), "little")
+
+        # tiles that have a tile to their right / left, without wrapping around to the next / previous row
+        notLast = int.from_bytes((bytes([1]) * (width - 1) + bytes(1)) * height, "little")
+        notFirst = int.from_bytes((bytes(1) + bytes([1]) * (width - 1)) * height, "little")
+
+        right = free & (free >> 8) & notLast
+        down = free & (free >> 8 * width)
+        up = free & (free << 8 * width)
+        left = free & (free << 8) & notFirst
+
+        self.moves = (right | down << 1 | up << 2 | left << 3).to_bytes(n, "little")
+
+        self.offsets = {RIGHT : 1, DOWN : width, UP : -width, LEFT : -1}
+        self.tables = {}
+
+    @classmethod
+    def fromGrid(cls, grid):
+        # returns the adjacency of grid (grid[y][x] tells you if it is a wall), reusing it if the walls were compiled before
+        width = len(grid[0])
+        height = len(grid)
+        walls = b"".join(bytes(row) for row in grid)
+
+        key = (width, walls)
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        adjacency = cls(walls, width, height)
+
+        cache[key] = adjacency
+        if len(cache) > CACHE_SIZE:
+            cache.popitem(last = False)
+
+        return adjacency
+
+    def neighbors(self, order = DIRECTIONS):
+        # returns a table where table[moves[i]] are the offsets of the neighbors of i, in the order of the directions
+        # (the order a search looks at its neighbors changes the way it moves)
+        if order not in self.tables:
+            self.tables[order] = [tuple(self.offsets[d] for d in order if mask & d) for mask in range(16)]
+
+        return self.tables[order]
@@ -0,0 +1,273 @@
+from itertools import chain
+import hashlib
+
+# the state of every tile of the grid, stored as one byte per tile in a flat array
+#   - tile (x, y) is at index y * width + x
+#   - operations on the whole board use bytes.translate and slicing, so they run in C instead of a python loop
+
+# states
+TILE = 0 # when the state is tile it is not drawn since the background is already tile color
+WALL = 1
+SEEN = 2
+PATH = 3
+CURRENT = 4
+ORIGIN = 5
+TARGET = 6
+
+N_STATES = 7
+
+def translation(mapping):
+    # builds a table for bytes.translate, states not in mapping are left as they are
+    table = bytearray(range(256))
+    for old, new in mapping.items():
+        table[old] = new
+    return bytes(table)
+
+# seen, path and current go back to tile
+CLEAR_SEARCH = translation({SEEN : TILE, PATH : TILE, CURRENT : TILE})
+
+# everything but the origin and the target goes back to tile
+CLEAR_ALL = translation({WALL : TILE, SEEN : TILE, PATH : TILE, CURRENT : TILE})
+
+# walls become 1, everything else becomes 0
+WALLS = translation({state : int(state == WALL) for state in range(N_STATES)})
+
+# the other way around, 0 becomes tile and anything else becomes wall
+FROM_WALLS = bytes([TILE]) + bytes([WALL]) * 255
+
+# terrain -> every tile also has a weight, moving onto it costs 1 + its weight (walls always have weight 0)
+#   - the weights are kept in their own flat array next to the states
+#   - for drawing, the state and the weight of a tile are packed into one byte as state | weight << 3 (see shaded),
+#     the packed array is only kept while some tile has terrain, and is updated with every tile that changes
+MAX_WEIGHT = 31
+
+# weight -> cost of moving onto the tile
+COSTS = bytes(min(w + 1, 255) for w in range(256))
+
+# weight -> weight << 3
+SHIFTED = bytes((w << 3) & 255 for w in range(256))
+
+def packedTranslation(table):
+    # the same as table for states packed with their weight, the weight is kept
+    return bytes((b & ~7) | table[b & 7] for b in range(256))
+
+CLEAR_SEARCH_PACKED = packedTranslation(CLEAR_SEARCH)
+
+MASK = (1 << 64) - 1
+
+def cellKey(i):
+    # random looking 64 bit key of the tile at index i (splitmix64), computed when needed instead of kept in a table
+    z = (i + 0x9E3779B97F4A7C15) & MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+def weightKey(i, weight):
+    # key of the tile at index i having weight, weight 0 has no key so a board without terrain keeps the key of its walls
+    if weight == 0:
+        return 0
+    
+    return cellKey(weight << 40 | i)
+
+class Board:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        self.states = bytearray(width * height) # every tile starts as TILE (0)
+        self.weights = bytearray(width * height) # and has no terrain
+
+        # tiles with a weight, and the states packed with the weights while there are some (see shaded)
+        self.weighted = 0
+        self.packed = None
+
+        # indices of the tiles that changed since they were last drawn
+        #   - when the whole board changes at once allDirty is set instead of adding every tile
+        self.dirty = set()
+        self.allDirty = True
+
+        # identifies the walls and the terrain without comparing them (see mapKey)
+        #   - wallsDigest is a hash of the walls and weights the last time all of them were replaced
+        #   - wallsXor is the xor of the keys of the tiles that became or stopped being walls
+        #     or changed their weight since then (zobrist hashing)
+        self.wallsDigest = None
+        self.wallsXor = 0
+        
+        # indices of the tiles that became or stopped being walls since the edits were last taken
+        #   - None when all the walls were replaced at once, like dirty and allDirty
+        self.edits = None
+        
+        self.hashWalls()
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def toTile(self, index):
+        return (index % self.width, index // self.width)
+
+    def get(self, x, y):
+        return self.states[y * self.width + x]
+
+    def set(self, x, y, state):
+        i = y * self.width + x
+
+        if self.states[i] != state:
+            if (self.states[i] == WALL) != (state == WALL):
+                self.wallsXor ^= cellKey(i)
+                
+                if self.edits != None:
+                    self.edits.add(i)
+                
+                if state == WALL:
+                    self.setWeight(x, y, 0)
+
+            self.states[i] = state
+            self.dirty.add(i)
+
+            if self.packed != None:
+                self.packed[i] = state | self.weights[i] << 3
+
+    def getWeight(self, x, y):
+        return self.weights[y * self.width + x]
+    
+    def setWeight(self, x, y, weight):
+        i = y * self.width + x
+        
+        if self.weights[i] != weight:
+            self.wallsXor ^= weightKey(i, self.weights[i]) ^ weightKey(i, weight)
+            self.weighted += (weight != 0) - (self.weights[i] != 0)
+            
+            self.weights[i] = weight
+            self.dirty.add(i)
+            
+            if self.weighted == 0:
+                self.packed = None
+            elif self.packed == None:
+                self.pack()
+            else:
+                self.packed[i] = self.states[i] | weight << 3
+    
+    def paint(self, tiles, state):
+        # sets the state of every (x, y) in tiles, except for the origin, the target and the walls
+        #   -> only used for the states of a search, it never paints over walls
+        for x, y in tiles:
+            i = y * self.width + x
+
+            if self.states[i] != state and self.states[i] != ORIGIN and self.states[i] != TARGET and self.states[i] != WALL:
+                self.states[i] = state
+                self.dirty.add(i)
+
+                if self.packed != None:
+                    self.packed[i] = state | self.weights[i] << 3
+
+    def applyChanges(self, seen, previous, current, removed, added, unseen = ()):
+        # paints what changed in a search since the last time (see util/Changes)
+        #   - unseen are only reported when moving a replay backwards
+        self.paint([previous], SEEN)
+        self.paint(removed, SEEN)
+        self.paint(unseen, TILE)
+        self.paint(seen, SEEN)
+        self.paint(added, PATH)
+        self.paint([current], CURRENT)
+
+    def takeDirty(self):
+        # returns the indices of the tiles to draw again (None if it is the whole board) and resets them
+        dirty = None if self.allDirty else self.dirty
+
+        self.dirty = set()
+        self.allDirty = False
+
+        return dirty
+
+    def clearSearch(self):
+        # removes seen, path and current tiles
+        self.states[:] = self.states.translate(CLEAR_SEARCH)
+        self.allDirty = True
+
+        if self.packed != None:
+            self.packed[:] = self.packed.translate(CLEAR_SEARCH_PACKED)
+
+    def clear(self):
+        # removes everything except for the origin and the target
+        self.states[:] = self.states.translate(CLEAR_ALL)
+        self.weights[:] = bytes(len(self.weights))
+        self.weighted = 0
+        self.packed = None
+        self.allDirty = True
+        self.hashWalls()
+
+    def setWalls(self, walls, keep):
+        # replaces the board with the given walls, keeping the states of the tiles in keep (like the origin and target)
+        #   - walls is either a flat bytes-like object or a list of rows, where a truthy value is a wall
+        #   - the terrain is removed
+        if not isinstance(walls, (bytes, bytearray, memoryview)):
+            walls = bytes(chain.from_iterable(walls))
+
+        kept = [(i, self.states[i]) for i in keep]
+
+        self.states[:] = bytes(walls).translate(FROM_WALLS)
+
+        for i, state in kept:
+            self.states[i] = state
+
+        self.weights[:] = bytes(len(self.weights))
+        self.weighted = 0
+        self.packed = None
+        self.allDirty = True
+        self.hashWalls()
+
+    def hashWalls(self):
+        # hashes all the walls and weights again, after they were replaced at once
+        digest = hashlib.blake2b(self.getWalls(), digest_size = 16)
+        digest.update(self.weights)
+        
+        self.wallsDigest = digest.digest()
+        self.wallsXor = 0
+        self.edits = None
+
+    def takeEdits(self):
+        # returns the indices of the tiles whose walls changed (None if all of them were replaced) and resets them
+        edits = self.edits
+        self.edits = set()
+        
+        return edits
+    
+    def mapKey(self):
+        # the same walls give the same key, so it can be used to look up results of searches on them
+        #   - changing a single tile only updates wallsXor, so the key is always ready
+        #   - the same walls reached in different ways (drawn by hand vs loaded) may have different keys, never the other way around
+        return (self.width, self.height, self.wallsDigest, self.wallsXor)
+
+    def getWalls(self):
+        # returns a flat bytes object where walls are 1 and everything else 0
+        return self.states.translate(WALLS)
+
+    def hasTerrain(self):
+        return self.weighted > 0
+    
+    def getCosts(self):
+        # returns the costs as a list of rows, where costs[y][x] is what moving onto (x, y) costs
+        costs = self.weights.translate(COSTS)
+        return [costs[i:i + self.width] for i in range(0, len(costs), self.width)]
+    
+    def shaded(self):
+        # the states with the weights packed in (state | weight << 3), or the states themselves when there is no terrain
+        #   -> neither is a copy, they are kept up to date as the tiles change
+        if self.packed == None:
+            return self.states
+        
+        return self.packed
+    
+    def pack(self):
+        # packs every state with its weight, when the first tile gets terrain
+        #   - the states are less than 8, so or-ing the two arrays as big integers packs every byte without carries
+        n = len(self.states)
+        states = int.from_bytes(self.states, "little")
+        weights = int.from_bytes(self.weights.translate(SHIFTED), "little")
+        
+        self.packed = bytearray((states | weights).to_bytes(n, "little"))
+    
+    def getGrid(self):
+        # returns the walls as a list of rows, where grid[y][x] tells you if it is a wall (1) or a tile (0)
+        walls = self.getWalls()
+        return [walls[i:i + self.width] for i in range(0, len(walls), self.width)]
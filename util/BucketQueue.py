@@ -0,0 +1,61 @@
+import heapq
+
+# priority queues for searches on maps with small integer costs, where the priorities pushed never go below the last one popped
+#   - BucketQueue (Dial's algorithm) keeps a list of items per priority in a ring of span buckets, so pushing and popping
+#     don't compare anything, finding the next priority only skips the empty buckets in between
+#   - HeapQueue is the usual binary heap, for when the priorities can be too far apart for the ring
+#   - both pop the last item pushed first among the ones with the same priority, so they give the same order
+
+# biggest span that uses buckets, see makeQueue
+BUCKET_LIMIT = 256
+
+class BucketQueue:
+    def __init__(self, span):
+        # every priority pushed has to be less than span above the last one popped
+        self.span = span
+        self.buckets = [[] for _ in range(span)]
+        self.base = 0 # smallest priority that can still be in the queue, set by push
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        # the first priority can be anything, the ring starts there and moves back if a smaller one is pushed later
+        if self.size == 0 or priority < self.base:
+            self.base = priority
+
+        self.buckets[priority % self.span].append(item)
+        self.size += 1
+
+    def pop(self):
+        # returns (priority, item) of an item with the smallest priority, the queue can't be empty
+        while not self.buckets[self.base % self.span]:
+            self.base += 1
+
+        self.size -= 1
+        return (self.base, self.buckets[self.base % self.span].pop())
+
+class HeapQueue:
+    def __init__(self):
+        self.heap = []
+        self.pushed = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        # ties are broken by the order they were pushed in, the last one first
+        heapq.heappush(self.heap, (priority, -self.pushed, item))
+        self.pushed += 1
+
+    def pop(self):
+        priority, _, item = heapq.heappop(self.heap)
+        return (priority, item)
+
+def makeQueue(span):
+    # the fastest queue for priorities that are never more than span - 1 above the last one popped
+    if span <= BUCKET_LIMIT:
+        return BucketQueue(span)
+
+    return HeapQueue()
@@ -0,0 +1,92 @@
+from math import floor, ceil
+
+# which part of the board is shown in the viewport and how big its tiles are
+#   - scale is the size of a tile in pixels, below 1 a pixel covers more than one tile
+#   - (x, y) is the pixel of the whole board (at this scale) that is at the top left corner of the viewport
+#   - boards smaller than the viewport are centered, bigger ones can be panned until their edge
+
+# the sizes a tile can have, zooming moves to the next / previous one
+SCALES = [1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 10, 12, 16, 20, 25, 32, 40, 48, 64]
+
+class Camera:
+    def __init__(self, left, top, width, height, columns, rows, scale):
+        # viewport on the screen
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+        # size of the board in tiles
+        self.columns = columns
+        self.rows = rows
+
+        self.scale = scale
+        self.x = 0
+        self.y = 0
+        self.clamp()
+
+    def clamp(self):
+        self.x = self.clampAxis(self.x, self.columns, self.width)
+        self.y = self.clampAxis(self.y, self.rows, self.height)
+
+    def clampAxis(self, offset, tiles, size):
+        board = tiles * self.scale
+
+        if board <= size:
+            return -floor((size - board) / 2)
+
+        return min(max(offset, 0), ceil(board - size))
+
+    def pan(self, dx, dy):
+        # moves the board by (dx, dy) pixels
+        self.x -= dx
+        self.y -= dy
+        self.clamp()
+
+    def zoomAt(self, steps, px, py):
+        # zooms in (steps > 0) or out (steps < 0) keeping the tile under the pixel (px, py) where it is
+        i = self.level() + steps
+        self.setScale(SCALES[min(max(i, 0), len(SCALES) - 1)], px, py)
+
+    def setScale(self, scale, px, py):
+        u = (px - self.left + self.x) / self.scale
+        v = (py - self.top + self.y) / self.scale
+
+        self.scale = scale
+        self.x = round(u * scale - (px - self.left))
+        self.y = round(v * scale - (py - self.top))
+        self.clamp()
+
+    def fit(self):
+        # the biggest scale that shows the whole board
+        scale = SCALES[0]
+        for s in SCALES:
+            if self.columns * s <= self.width and self.rows * s <= self.height:
+                scale = s
+
+        self.scale = scale
+        self.clamp()
+
+    def level(self):
+        # index of the closest scale in SCALES
+        return min(range(len(SCALES)), key = lambda i: abs(SCALES[i] - self.scale))
+
+    def toTile(self, px, py):
+        # tile under the pixel (px, py), it may be outside the board
+        return (floor((px - self.left + self.x) / self.scale), floor((py - self.top + self.y) / self.scale))
+
+    def toScreen(self, x, y):
+        # pixel of the top left corner of tile (x, y)
+        return (self.left + floor(x * self.scale) - self.x, self.top + floor(y * self.scale) - self.y)
+
+    def inside(self, x, y):
+        return 0 <= x < self.columns and 0 <= y < self.rows
+
+    def visible(self):
+        # (first column, first row, last column + 1, last row + 1) of the tiles in the viewport
+        x0 = max(floor(self.x / self.scale), 0)
+        y0 = max(floor(self.y / self.scale), 0)
+        x1 = min(ceil((self.x + self.width) / self.scale), self.columns)
+        y1 = min(ceil((self.y + self.height) / self.scale), self.rows)
+
+        return (x0, y0, x1, y1)
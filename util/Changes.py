@@ -0,0 +1,37 @@
+# collects what changed in a search since the last time it was drawn
+#   - so the grid only has to update the tiles that changed instead of repainting everything that was seen
+
+class Changes:
+    def __init__(self, current, width = None):
+        self.seen = [] # tiles seen since the last time the changes were taken
+        self.shown = current # current tile the last time the changes were taken
+        
+        # searches that work with cell ids (y * width + x) can give their width and add the ids to seen instead
+        # they are only turned into tiles when they are taken
+        self.width = width
+        
+    def take(self, current, parents):
+        # returns (seen, previous, current, removed, added)
+        #   - seen -> tiles that were seen for the first time
+        #   - previous -> the current tile the last time, current -> the current tile now
+        #   - removed, added -> tiles that left and joined the path to the current tile
+        seen = self.takeSeen()
+        previous = self.shown
+        
+        self.shown = current
+        
+        removed, added = parents.diff(previous, current)
+        
+        # previous and current may be nodes (x, y, layer) of a search with more than one tree, only the tiles are shown
+        return (seen, previous[:2], current[:2], removed, added)
+    
+    def takeSeen(self):
+        # returns only the tiles seen since the last time and forgets them, for when the path is not needed
+        seen = self.seen
+        self.seen = []
+        
+        if self.width != None:
+            W = self.width
+            seen = [(i % W, i // W) for i in seen]
+        
+        return seen
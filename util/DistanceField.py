@@ -0,0 +1,86 @@
+from array import array
+import time
+from util.Adjacency import Adjacency, RIGHT, DOWN, UP, LEFT
+
+# length of the shortest path from one tile (the source) to every other tile, so the path from any tile to the source
+# is found by walking downhill, one tile per step, without searching
+#   - it is a breadth first search from the source, run a layer at a time
+#   - it can be grown a bit every frame (see grow), the distances it has are final as soon as they are there
+#   - tiles are cell ids (y * width + x), see util/Adjacency
+
+# order the neighbors are tried in when walking downhill
+ORDER = (RIGHT, DOWN, UP, LEFT)
+
+class DistanceField:
+    def __init__(self, walls, width, height, source):
+        # walls is a flat bytes-like object where anything but 0 is a wall (see Board.getWalls)
+        self.width = width
+        self.height = height
+        self.source = source
+
+        self.adjacency = Adjacency(walls, width, height)
+        self.neighbors = self.adjacency.neighbors(ORDER)
+
+        # distance[i] is -1 until i is reached
+        self.distance = array('i', [-1]) * (width * height)
+
+        root = self.index(source)
+        self.distance[root] = 0
+        self.frontier = [root]
+        self.layer = 0
+
+    def index(self, tile):
+        x, y = tile
+        return y * self.width + x
+
+    def done(self):
+        return not self.frontier
+
+    def grow(self, deadline = None):
+        # adds layers until every reachable tile has its distance, or until time.perf_counter() passes deadline
+        distance = self.distance
+        moves = self.adjacency.moves
+        neighbors = self.neighbors
+
+        while self.frontier:
+            self.layer += 1
+            layer = self.layer
+            nextFrontier = []
+
+            for i in self.frontier:
+                for offset in neighbors[moves[i]]:
+                    if distance[i + offset] < 0:
+                        distance[i + offset] = layer
+                        nextFrontier.append(i + offset)
+
+            self.frontier = nextFrontier
+
+            if deadline != None and time.perf_counter() > deadline:
+                break
+
+    def pathFrom(self, tile):
+        # path from tile to the source (both included)
+        #   - [] if there is none, None if the field doesn't know yet (it is still growing)
+        i = self.index(tile)
+        d = self.distance[i]
+
+        if d < 0:
+            return [] if self.done() else None
+
+        distance = self.distance
+        moves = self.adjacency.moves
+        neighbors = self.neighbors
+        W = self.width
+
+        path = [tile]
+        while d > 0:
+            # some neighbor is always one step closer
+            for offset in neighbors[moves[i]]:
+                if distance[i + offset] == d - 1:
+                    i += offset
+                    break
+
+            d -= 1
+            path.append((i % W, i // W))
+
+        return path
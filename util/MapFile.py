@@ -0,0 +1,206 @@
+# reading maps from files, so they can be solved without drawing them first
+#
+# text format -> one line per row of the grid
+#   - '#' is a wall
+#   - 'O' is the origin and 'T' is the target (upper left and bottom right corner if they are missing)
+#   - anything else is a tile, '.' is used when writing
+#
+# binary format (.gtm) -> a header followed by the walls, one bit per tile
+#   - header -> magic, version, width, height, origin, target (as y * width + x), if there is a seed, seed
+#   - every row starts at a new byte, tile x of a row is bit x % 8 of its byte x // 8 (1 is a wall)
+#   - the file is memory mapped when it is opened, so a tile can be read without loading the whole map
+
+import mmap
+import struct
+
+def loadText(path):
+    # returns (grid, origin, target) where grid[y][x] tells you if it is a wall (1) or a tile (0)
+    with open(path) as file:
+        lines = [line.rstrip("\r\n") for line in file]
+    
+    # ignore empty lines at the end of the file
+    while lines and lines[-1] == "":
+        lines.pop()
+        
+    if not lines:
+        raise ValueError(path + " has no rows")
+    
+    width = max(len(line) for line in lines)
+    
+    grid = []
+    origin = None
+    target = None
+    
+    for y, line in enumerate(lines):
+        # short lines are padded with tiles
+        line = line.ljust(width, ".")
+        
+        if "O" in line:
+            origin = (line.index("O"), y)
+        if "T" in line:
+            target = (line.index("T"), y)
+        
+        grid.append(bytes(int(c == "#") for c in line))
+        
+    if origin == None:
+        origin = (0, 0)
+    if target == None:
+        target = (width - 1, len(grid) - 1)
+    
+    return (grid, origin, target)
+
+def saveText(path, rows, origin, target):
+    # writes rows (any iterable of rows, like a list or a generator) to a text map, one line at a time
+    #   - rows[y][x] tells you if it is a wall (truthy) or a tile
+    with open(path, "w") as file:
+        for y, row in enumerate(rows):
+            line = ["#" if wall else "." for wall in row]
+            
+            if origin[1] == y:
+                line[origin[0]] = "O"
+            if target[1] == y:
+                line[target[0]] = "T"
+                
+            file.write("".join(line) + "\n")
+
+MAGIC = b"GTMP"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIIIBq") # magic, version, width, height, origin, target, has seed, seed
+
+# UNPACK[k] turns every byte into its bit k (0 or 1)
+UNPACK = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+# anything but 0 becomes 1
+ONES = bytes([0]) + bytes([1]) * 255
+
+def packBits(walls):
+    # packs a bytes-like object of 0 / 1 whose length is a multiple of 8 into one bit per item
+    #   - the k-th bit of every byte are taken at once with a slice, and turned into one big integer
+    n = len(walls) // 8
+    packed = 0
+
+    for k in range(8):
+        packed |= int.from_bytes(walls[k::8], "little") << k
+
+    return packed.to_bytes(n, "little")
+
+def unpackBits(packed):
+    # the other way around, returns a bytearray with 8 items of 0 / 1 per byte
+    walls = bytearray(len(packed) * 8)
+
+    for k in range(8):
+        walls[k::8] = packed.translate(UNPACK[k])
+
+    return walls
+
+def saveBinary(path, rows, width, height, origin, target, seed = None):
+    # writes rows (any iterable of rows, like a list or a generator) to a binary map, one row at a time
+    #   - rows[y][x] tells you if it is a wall (truthy) or a tile
+    rowBytes = (width + 7) // 8
+    padding = bytes(rowBytes * 8 - width)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, width, height, origin[1] * width + origin[0], target[1] * width + target[0],
+                               seed != None, seed if seed != None else 0))
+
+        for row in rows:
+            file.write(packBits(bytes(row).translate(ONES) + padding))
+
+class BinaryMap:
+    # a binary map opened with its walls memory mapped, use it with `with` so the file is closed
+    def __init__(self, path):
+        self.file = open(path, "rb")
+
+        try:
+            self.mapped = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError: # empty file
+            self.file.close()
+            raise ValueError(path + " is not a binary map")
+
+        if len(self.mapped) < HEADER.size:
+            self.close()
+            raise ValueError(path + " is not a binary map")
+
+        magic, version, self.width, self.height, origin, target, hasSeed, seed = HEADER.unpack_from(self.mapped)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(path + " is not a binary map")
+
+        self.origin = (origin % self.width, origin // self.width)
+        self.target = (target % self.width, target // self.width)
+        self.seed = seed if hasSeed else None
+
+        self.rowBytes = (self.width + 7) // 8
+
+        if len(self.mapped) < HEADER.size + self.rowBytes * self.height:
+            self.close()
+            raise ValueError(path + " is shorter than its map")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.mapped.close()
+        self.file.close()
+
+    def isWall(self, x, y):
+        # reads a single tile straight from the file
+        return (self.mapped[HEADER.size + y * self.rowBytes + x // 8] >> (x % 8)) & 1
+
+    def rows(self, start = 0, stop = None):
+        # yields the rows from start to stop as bytearrays of 0 / 1, only one row is unpacked at a time
+        stop = self.height if stop == None else stop
+
+        for y in range(start, stop):
+            offset = HEADER.size + y * self.rowBytes
+            yield unpackBits(self.mapped[offset:offset + self.rowBytes])[:self.width]
+
+    def walls(self):
+        # all the walls as a flat bytearray, 1 for walls and 0 for tiles (like Board.getWalls)
+        walls = unpackBits(self.mapped[HEADER.size:HEADER.size + self.rowBytes * self.height])
+
+        # every row has up to 7 bits of padding
+        if self.width % 8 != 0:
+            W = self.rowBytes * 8
+            walls = bytearray().join(walls[y * W:y * W + self.width] for y in range(self.height))
+
+        return walls
+
+def loadBinary(path):
+    # returns (grid, origin, target) like loadText
+    with BinaryMap(path) as binary:
+        walls = binary.walls()
+        W = binary.width
+
+        return ([walls[i:i + W] for i in range(0, len(walls), W)], binary.origin, binary.target)
+
+def load(path):
+    # text or binary depending on the extension of path
+    if path.lower().endswith(".gtm"):
+        return loadBinary(path)
+
+    return loadText(path)
+
+def save(path, rows, width, height, origin, target, seed = None):
+    if path.lower().endswith(".gtm"):
+        saveBinary(path, rows, width, height, origin, target, seed)
+    else:
+        saveText(path, rows, origin, target)
+
+def main():
+    # converts a map between the text and the binary format, depending on the extensions
+    #   -> python util/MapFile.py maze.txt maze.gtm
+    import sys
+
+    if len(sys.argv) != 3:
+        raise SystemExit("usage: python util/MapFile.py INPUT OUTPUT   (.gtm for binary, anything else for text)")
+
+    grid, origin, target = load(sys.argv[1])
+    save(sys.argv[2], grid, len(grid[0]), len(grid), origin, target)
+
+if __name__ == "__main__":
+    main()
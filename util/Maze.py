@@ -1,255 +1,227 @@
-# following algorithm described by the answer: 
+# following algorithm described by the answer:
 # https://stackoverflow.com/questions/22305644/how-to-generate-a-maze-with-more-than-one-successful-path
 
 # steps:
 #     1. Create a grid where odd rows and columns are walls
-#     2. Create two sets: origin, target, undiscovered
-#      - the sets store cells in a (w, h) tuple
-#     3. At random, remove a wall that reveals a cell from undiscovered and adds it to either origin or target set
+#     2. Mark every cell as origin, target or undiscovered
+#      - cells are flat indices h * width + w, so they can be kept in bytearrays
+#     3. At random, remove a wall that reveals a cell from undiscovered and adds it to either origin or target
 #      - the wall has to be even in one h or w coordinate -> (odd, odd) will never be removed for it to look more "mazey"
 #     4. When there are no cells from undiscovered, remove x walls that connect origin to target
 #      - x is the number of solutions that there'll be
 
+from util.RandomSet import RandomSet
+
 import random
 
+# owner of each cell
+NOTHING = 0 # not a cell (a wall position)
+UNDISCOVERED = 1
+ORIGIN = 2
+TARGET = 3
+
 class Maze():
-    def __init__(self, width, height, origin, target):
+    def __init__(self, width, height, origin, target, seed = None):
         self.width = width
         self.height = height
-        
-        
-        self.origin = set([origin])
-        self.target = set([target])
-        
-        self.undiscovered = set()
-        self.walls = set()
-        
-        # populate the undiscovered set with all empty cells that are not the origin or the target
-        for w in range(0, self.width, 2):
-            for h in range(0, self.height, 2):
-                if (w, h) != origin and (w, h) != target:
-                    self.undiscovered.add((w,h))
-                
-        # populate walls set with walls
-            # columns
-        for w in range(1, self.width, 2):
-            for h in range(0, self.height):
-                self.walls.add((w,h))
-            # rows
-        for h in range(1, self.height, 2):
-            for w in range(0, self.width):
-                self.walls.add((w,h))
-
-        # used to determine were we can break through    
-        #   - frontier is a list of walls we can potentially break    
-        self.originFrontier = set(self.getFrontier(origin))
-        self.targetFrontier = set(self.getFrontier(target))
-        
-        
-        # if the origin or the target are in a spot where a wall goes -> remove the wall and update sets
+
+        # the same seed always generates the same maze, None picks a different one every time
+        self.random = random.Random(seed)
+
+        # walls[i] is 1 for a wall and 0 for a tile
+        #   -> odd columns and odd rows are walls
+        cellRow = bytes(w % 2 for w in range(self.width))
+        wallRow = bytes([1]) * self.width
+        self.walls = bytearray(b"".join(wallRow if h % 2 else cellRow for h in range(self.height)))
+
+        # owner[i] tells if the cell i belongs to the origin, the target or was not discovered yet
+        cellRow = bytes(UNDISCOVERED if w % 2 == 0 else NOTHING for w in range(self.width))
+        wallRow = bytes(self.width)
+        self.owner = bytearray(b"".join(wallRow if h % 2 else cellRow for h in range(self.height)))
+
+        self.undiscovered = self.owner.count(UNDISCOVERED) # cells left to discover
+
+        o = self.index(origin)
+        t = self.index(target)
+
+        for i, side in ((o, ORIGIN), (t, TARGET)):
+            if self.owner[i] == UNDISCOVERED:
+                self.undiscovered -= 1
+            self.owner[i] = side
+
+        # used to determine were we can break through
+        #   - frontier is a set of walls we can potentially break, one can be picked at random in constant time
+        self.originFrontier = RandomSet(self.getFrontier(o))
+        self.targetFrontier = RandomSet(self.getFrontier(t))
+
+        # if the origin or the target are in a spot where a wall goes -> remove the wall and update the cells
         self.checkNodesInWall(origin, target)
-        
+
+    def index(self, tile):
+        w, h = tile
+        return h * self.width + w
+
     #       M A I N   A L G O R I T H M   F U N C T I O N
     def createMaze(self, n_of_solutions):
         # step 3
         self.removeWalls()
-        
+
         # step 4
         self.addSolutions(n_of_solutions)
 
         # optional step -> when the last column / row is a wall the algorithm doesnt remove it so it ends up looking odd
         self.fixOddWalls()
-        
-        return self.setsToGrid()
-                
+
+        return self.toGrid()
+
     def checkNodesInWall(self, origin, target):
-        w, h = origin
-        if not (w % 2 == 0 and h % 2 == 0):
-            self.walls.remove(origin)
-            
-            if w % 2 == 0 or h % 2 == 0: # in a removeable wall
-                if (w+1, h) in self.undiscovered:
-                    self.undiscovered.remove((w+1, h))
-                    self.origin.add((w+1, h))
-                    self.originFrontier.update(self.getFrontier((w+1, h)))
-                if (w-1, h) in self.undiscovered:
-                    self.undiscovered.remove((w-1, h))
-                    self.origin.add((w-1, h))
-                    self.originFrontier.update(self.getFrontier((w-1, h)))
-                if (w, h+1) in self.undiscovered:
-                    self.undiscovered.remove((w, h+1))
-                    self.origin.add((w, h+1))
-                    self.originFrontier.update(self.getFrontier((w, h+1)))
-                if (w, h-1) in self.undiscovered:
-                    self.undiscovered.remove((w, h-1))
-                    self.origin.add((w, h-1))
-                    self.originFrontier.update(self.getFrontier((w, h-1)))
-                
-                # otherwise origin is in a non removable wall but we remove it and the frontier is already correct
-                
-        w, h = target
-        if not (w % 2 == 0 and h % 2 == 0):
-            self.walls.remove(target)
-            
-            if w % 2 == 0 or h % 2 == 0: # in a removeable wall
-                if (w+1, h) in self.undiscovered:
-                    self.undiscovered.remove((w+1, h))
-                    self.target.add((w+1, h))
-                    self.targetFrontier.update(self.getFrontier((w+1, h)))
-                if (w-1, h) in self.undiscovered:
-                    self.undiscovered.remove((w-1, h))
-                    self.target.add((w-1, h))
-                    self.targetFrontier.update(self.getFrontier((w-1, h)))
-                if (w, h+1) in self.undiscovered:
-                    self.undiscovered.remove((w, h+1))
-                    self.target.add((w, h+1))
-                    self.targetFrontier.update(self.getFrontier((w, h+1)))
-                if (w, h-1) in self.undiscovered:
-                    self.undiscovered.remove((w, h-1))
-                    self.target.add((w, h-1))
-                    self.targetFrontier.update(self.getFrontier((w, h-1)))
-                
-                # otherwise target is in a non removable wall but we remove it and the frontier is already correct
-                
-        
-    
-    
-    
+        for node, side, frontier in ((origin, ORIGIN, self.originFrontier), (target, TARGET, self.targetFrontier)):
+            w, h = node
+
+            if not (w % 2 == 0 and h % 2 == 0):
+                self.walls[self.index(node)] = 0
+
+                if w % 2 == 0 or h % 2 == 0: # in a removeable wall
+                    for cell in self.tileIfRemoveWall(self.index(node)):
+                        self.discover(cell, side, frontier)
+
+                # otherwise node is in a non removable wall but we remove it and the frontier is already correct
+
+    def discover(self, cell, side, frontier):
+        # adds an undiscoverd cell to the origin or the target, and the walls around it to its frontier
+        self.owner[cell] = side
+        self.undiscovered -= 1
+
+        add = frontier.add
+        for wall in self.getFrontier(cell):
+            add(wall)
+
     def removeWalls(self):
-        while (self.undiscovered): # loop until all cells are either in origin or target
-                     
-            if self.originFrontier:
-                wall = random.choice(list(self.originFrontier))
-                
-                newTiles = self.tileIfRemoveWall(wall)
-
-                if newTiles:
-                    self.walls.remove(wall)
-
-                    for newTile in newTiles:
-                        # add new discoverd tile to origin and delete it from discovered
-                        self.undiscovered.remove(newTile)
-                        self.origin.add(newTile)
-                        
-                        # add new discovered frontiers to originFrontier
-                        self.originFrontier.update(self.getFrontier(newTile))
-                
-                else: 
-                    # that wall didnt discover a newTile
-                    self.originFrontier.remove(wall)
-                
-            if self.targetFrontier:
-                wall = random.choice(list(self.targetFrontier))
-                
-                newTiles = self.tileIfRemoveWall(wall)
-
-                if newTiles:
-                    self.walls.remove(wall)
-
-                    for newTile in newTiles:
-                        # add new discoverd tile to target and delete it from discovered
-                        self.undiscovered.remove(newTile)
-                        self.target.add(newTile)
-                        
-                        # add new discovered frontiers to targetFrontier
-                        self.targetFrontier.update(self.getFrontier(newTile))
-                
-                else: 
-                    # that wall didnt discover a newTile
-                    self.targetFrontier.remove(wall)
-                
+        # loop until all cells are either in origin or target, or neither of them can grow anymore
+        # (cells can be cut off when the origin or the target are in a wall)
+        sides = ((ORIGIN, self.originFrontier), (TARGET, self.targetFrontier))
+
+        # this loop runs about once per cell, so the methods it uses are looked up only once
+        tileIfRemoveWall = self.tileIfRemoveWall
+        discover = self.discover
+        walls = self.walls
+        rand = self.random
+
+        while self.undiscovered and (self.originFrontier or self.targetFrontier):
+
+            for side, frontier in sides:
+                if frontier:
+                    # the wall is taken out of the frontier either way, it is either removed or it didnt discover a new cell
+                    wall = frontier.pop(rand)
+
+                    newCells = tileIfRemoveWall(wall)
+
+                    if newCells:
+                        walls[wall] = 0
+
+                        for cell in newCells:
+                            discover(cell, side, frontier)
 
     def addSolutions(self, n_of_solutions):
-        while(n_of_solutions > 0):            
-            wall = random.choice(list(self.walls))
-            
-            if self.connectsFrontiers(wall):
-                self.walls.remove(wall)
-                n_of_solutions -= 1
-    
-    def connectsFrontiers(self, wall):
-        # returns true if removing that wall connects the origin and target
-        w, h = wall
-        
-        # try horizontally
-        tile1 = (w - 1, h)
-        tile2 = (w + 1, h)
-        
-        
-        if (tile1 in self.origin and tile2 in self.target) or (tile1 in self.target and tile2 in self.origin):
-            return True
-        
-        # try vertically
-        tile1 = (w, h - 1)
-        tile2 = (w, h + 1)
-        
-        if (tile1 in self.origin and tile2 in self.target) or (tile1 in self.target and tile2 in self.origin):
-            return True
-        
-        return False
-    
-    def setsToGrid(self):
-        # returns a 2d set where False is a tile and True is a wall
-        grid = []
-        for h in range(self.height):
-            row = []
-            for w in range(self.width):
-                if (w, h) in self.walls:
-                    row.append(True)
-                else: 
-                    row.append(False)
-            
-            grid.append(row)
-        
-        return grid
-
-    def getFrontier(self, tile):
-        # given a tile, return a list of all walls neigboring that tile
-        frontier = [] # list is used so that it can be unpacked with the *frontier operator
-        w, h = tile
-        
-        
-        if (w+1, h) in self.walls and self.canRemove((w+1, h)): frontier.append((w+1,h))
-        if (w-1, h) in self.walls and self.canRemove((w-1, h)): frontier.append((w-1, h))
-        if (w, h+1) in self.walls and self.canRemove((w, h+1)): frontier.append((w, h+1))
-        if (w, h-1) in self.walls and self.canRemove((w, h-1)): frontier.append((w, h-1))
-        
+        # removes up to n_of_solutions walls that connect origin and target, fewer if there are not that many
+        candidates = self.connectingWalls()
+
+        for wall in self.random.sample(candidates, min(n_of_solutions, len(candidates))):
+            self.walls[wall] = 0
+
+    def connectingWalls(self):
+        # returns every wall that connects the origin and the target if it is removed
+        #   - only walls between two cells in the same row (odd w, even h) or column (even w, odd h) can do it
+        walls = []
+        W = self.width
+        owner = self.owner
+
+        # horizontally
+        for h in range(0, self.height, 2):
+            start = h * W
+            row = owner[start:start + W]
+
+            for w, (left, right) in enumerate(zip(row, row[2:]), 1):
+                if left + right == ORIGIN + TARGET and left != right and self.walls[start + w]:
+                    walls.append(start + w)
+
+        # vertically
+        for h in range(1, self.height - 1, 2):
+            start = h * W
+            above = owner[start - W:start]
+            below = owner[start + W:start + 2 * W]
+
+            for w, (up, down) in enumerate(zip(above, below)):
+                if up + down == ORIGIN + TARGET and up != down and self.walls[start + w]:
+                    walls.append(start + w)
+
+        return walls
+
+    def toGrid(self):
+        # returns a list of rows where grid[h][w] is 1 for a wall and 0 for a tile
+        W = self.width
+        return [self.walls[h * W:(h + 1) * W] for h in range(self.height)]
+
+    def getFrontier(self, cell):
+        # given a cell, return a list of the walls neigboring that cell that would discover a new cell if removed
+        #   - a wall that can't discover anything anymore would only be taken out of the frontier later
+        W = self.width
+        w = cell % W
+        walls = self.walls
+        owner = self.owner
+
+        frontier = []
+
+        # the origin or the target may be in a wall, then it is next to whichever removable walls there are
+        if w % 2 or (cell // W) % 2:
+            if w + 1 < W and walls[cell + 1]: frontier.append(cell + 1)
+            if w > 0 and walls[cell - 1]: frontier.append(cell - 1)
+            if cell + W < len(walls) and walls[cell + W]: frontier.append(cell + W)
+            if cell >= W and walls[cell - W]: frontier.append(cell - W)
+
+            return [wall for wall in frontier if self.canRemove(wall)]
+
+        # every wall next to a (even, even) cell is between it and the cell 2 tiles away in the same direction
+        if w + 2 < W and walls[cell + 1] and owner[cell + 2] == UNDISCOVERED: frontier.append(cell + 1)
+        if w >= 2 and walls[cell - 1] and owner[cell - 2] == UNDISCOVERED: frontier.append(cell - 1)
+        if cell + 2 * W < len(walls) and walls[cell + W] and owner[cell + 2 * W] == UNDISCOVERED: frontier.append(cell + W)
+        if cell >= 2 * W and walls[cell - W] and owner[cell - 2 * W] == UNDISCOVERED: frontier.append(cell - W)
+
         return frontier
-    
-    def canRemove(self, tile):
+
+    def canRemove(self, wall):
         # returns true if wall is not odd_w, odd_h
-        
-        w, h = tile
-        
-        if (w % 2) != 0 and (h % 2) != 0:
-            return False
-        else:
-            return True
+        w = wall % self.width
+        h = wall // self.width
+
+        return not ((w % 2) != 0 and (h % 2) != 0)
 
-        
-    
     def tileIfRemoveWall(self, wall):
-        # return undiscoverd if removing the wall discovers a undiscovered tile
-        w, h = wall
-        
-        walls = list()
-        
-        if (w+1, h) in self.undiscovered: walls.append((w+1, h))
-        if (w-1, h) in self.undiscovered: walls.append((w-1, h))
-        if (w, h+1) in self.undiscovered: walls.append((w, h+1))
-        if (w, h-1) in self.undiscovered: walls.append((w, h-1))
-        
-        return walls
+        # return the undiscoverd cells that removing the wall would discover
+        #   - a removable wall in an odd column is between the cells left and right of it, otherwise above and below it
+        W = self.width
+        w = wall % W
+        owner = self.owner
+
+        cells = []
+
+        if w % 2:
+            if owner[wall - 1] == UNDISCOVERED: cells.append(wall - 1)
+            if w + 1 < W and owner[wall + 1] == UNDISCOVERED: cells.append(wall + 1)
+        else:
+            if wall >= W and owner[wall - W] == UNDISCOVERED: cells.append(wall - W)
+            if wall + W < len(owner) and owner[wall + W] == UNDISCOVERED: cells.append(wall + W)
+
+        return cells
 
     def fixOddWalls(self):
         # you could do it at random but this technique is more efficient and it looks good
-        
+        W = self.width
+
         if (self.width - 1) % 2 != 0:
             for w in range(0, self.width, 4):
-                if (w, self.height-1) in self.walls:
-                    self.walls.remove((w, self.height-1))
-                
+                self.walls[(self.height - 1) * W + w] = 0
+
         if (self.height - 1) % 2 != 0:
             for h in range(0, self.height, 4):
-                if (self.width-1, h) in self.walls:
-                    self.walls.remove((self.width-1, h))
\ No newline at end of file
+                self.walls[h * W + self.width - 1] = 0
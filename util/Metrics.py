@@ -0,0 +1,136 @@
+import csv
+import json
+from array import array
+from collections import deque
+
+# counters and timings of the solves and the frames, only collected when they are turned on
+#   - steps -> the frontier size after every step of a search (see frontierSize in the algorithms)
+#   - solves -> one row per search: steps, peak frontier, path length and time spent in stepSearch
+#   - frames -> one row per frame of the visualizer: seconds spent in update, draw and flip, and steps run
+#   - mazes -> seconds it took to generate every maze
+#
+# nothing in here imports pygame, so solve.py can use it too
+
+class Metrics:
+    def __init__(self, window = 60):
+        self.solves = []
+        self.frames = []
+        self.mazes = []
+
+        # frontier size after each step, and the solve it belongs to (index in solves)
+        self.frontier = array('i')
+        self.stepSolve = array('i')
+
+        # the last window frames, for the averages shown on screen
+        self.recent = deque(maxlen = window)
+
+    def startSolve(self, algorithm):
+        self.solves.append({
+            "algorithm" : algorithm,
+            "steps" : 0,
+            "peakFrontier" : 0,
+            "pathLength" : None,
+            "seconds" : 0.0,
+            "status" : 0,
+        })
+
+    def step(self, frontier, seconds):
+        # called after every step of the current solve
+        solve = self.solves[-1]
+        solve["steps"] += 1
+        solve["seconds"] += seconds
+        solve["peakFrontier"] = max(solve["peakFrontier"], frontier)
+
+        self.frontier.append(frontier)
+        self.stepSolve.append(len(self.solves) - 1)
+
+    def endSolve(self, status, pathLength):
+        solve = self.solves[-1]
+        solve["status"] = status
+        solve["pathLength"] = pathLength
+
+    def frame(self, update, draw, flip, steps = 0, pathLength = None):
+        row = {
+            "update" : update,
+            "draw" : draw,
+            "flip" : flip,
+            "steps" : steps,
+            "pathLength" : pathLength,
+        }
+        self.frames.append(row)
+        self.recent.append(row)
+
+    def maze(self, seconds):
+        self.mazes.append(seconds)
+
+    def summary(self):
+        # one line with the state of the last solve and the average frame timings, for the overlay
+        text = []
+
+        if self.solves:
+            solve = self.solves[-1]
+            text.append("steps %d" % solve["steps"])
+            text.append("frontier %d (peak %d)" % (self.frontier[-1] if self.frontier else 0, solve["peakFrontier"]))
+
+            pathLength = solve["pathLength"]
+            if pathLength == None and self.recent:
+                pathLength = self.recent[-1]["pathLength"]
+            if pathLength != None:
+                text.append("path %d" % pathLength)
+
+        if self.recent:
+            n = len(self.recent)
+            for key in ("update", "draw", "flip"):
+                text.append("%s %.2f ms" % (key, sum(row[key] for row in self.recent) / n * 1000))
+
+        if self.mazes:
+            text.append("maze %.1f ms" % (self.mazes[-1] * 1000))
+
+        return "   ".join(text)
+
+    def toDict(self):
+        return {
+            "solves" : self.solves,
+            "steps" : [{"solve" : s, "frontier" : f} for s, f in zip(self.stepSolve, self.frontier)],
+            "frames" : self.frames,
+            "mazes" : self.mazes,
+        }
+
+    def saveJson(self, path):
+        with open(path, "w") as file:
+            json.dump(self.toDict(), file, indent = 2)
+
+    def saveCsv(self, path):
+        # the steps go in path and the frames next to it (steps.csv -> steps-frames.csv), one row each
+        with open(path, "w", newline = "") as file:
+            writer = csv.writer(file)
+            writer.writerow(["solve", "algorithm", "step", "frontier"])
+
+            previous = None
+            step = 0
+            for s, f in zip(self.stepSolve, self.frontier):
+                step = step + 1 if s == previous else 1
+                previous = s
+                writer.writerow([s, self.solves[s]["algorithm"], step, f])
+
+        if self.frames:
+            with open(framesPath(path), "w", newline = "") as file:
+                writer = csv.writer(file)
+                writer.writerow(["frame", "update", "draw", "flip", "steps", "pathLength"])
+
+                for n, row in enumerate(self.frames):
+                    writer.writerow([n, row["update"], row["draw"], row["flip"], row["steps"], row["pathLength"]])
+
+    def save(self, path):
+        # json or csv depending on the extension of path
+        if path.lower().endswith(".csv"):
+            self.saveCsv(path)
+        else:
+            self.saveJson(path)
+
+def framesPath(path):
+    dot = path.rfind(".")
+    if dot <= path.replace("\\", "/").rfind("/"):
+        return path + "-frames"
+
+    return path[:dot] + "-frames" + path[dot:]
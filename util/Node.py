@@ -1,5 +0,0 @@
-class Node:
-    def __init__(self, x, y, path):
-        self.x = x
-        self.y = y
-        self.path = path
\ No newline at end of file
@@ -0,0 +1,159 @@
+from array import array
+import copy
+
+# predecessor table shared by the search algorithms
+#   - instead of every node carrying a copy of its path, each seen tile only remembers the tile it was reached from
+#   - the path to a tile is rebuilt by walking back to the root only when someone asks for it
+#   - searches that grow more than one tree (like bidirectional ones) use one layer per tree
+#     a node is then (x, y, layer) instead of a tile (x, y), which is the same as (x, y, 0)
+
+class Parents:
+    def __init__(self, width, height, layers = 1):
+        self.width = width
+        self.height = height
+        self.layers = layers
+        self.size = width * height # tiles per layer
+
+        # parent[layer * size + y * width + x] is the index of the node (x, y, layer) was reached from, -1 if it has no parent
+        self.parent = array('i', [-1]) * (self.size * layers)
+        
+        # depth[...] is the length of the path to the node, used to compare two paths without rebuilding them
+        self.depth = array('i', [0]) * (self.size * layers)
+
+    def copy(self):
+        # a table that can be changed without changing this one
+        parents = copy.copy(self)
+        parents.parent = array('i', self.parent)
+        parents.depth = array('i', self.depth)
+        
+        return parents
+
+    def index(self, node):
+        i = node[1] * self.width + node[0]
+        
+        if len(node) > 2:
+            i += node[2] * self.size
+        
+        return i
+
+    def toTile(self, index):
+        index %= self.size
+        return (index % self.width, index // self.width)
+    
+    def toNode(self, index):
+        x, y = self.toTile(index)
+        return (x, y, index // self.size)
+
+    def set(self, tile, parent):
+        i = self.index(tile)
+        p = self.index(parent)
+        
+        self.parent[i] = p
+        self.depth[i] = self.depth[p] + 1
+
+    def setIndex(self, i, p):
+        # same as set, with the indices of the nodes instead of the nodes
+        self.parent[i] = p
+        self.depth[i] = self.depth[p] + 1
+
+    def get(self, tile):
+        # returns the tile that (x, y) was reached from, or None for the root
+        i = self.parent[self.index(tile)]
+
+        if i == -1:
+            return None
+
+        return self.toTile(i)
+
+    def getPath(self, tile):
+        # returns the list of tiles from the root up to (but not including) tile
+        path = []
+
+        i = self.parent[self.index(tile)]
+        while i != -1:
+            path.append(self.toTile(i))
+            i = self.parent[i]
+
+        path.reverse()
+        return path
+
+    def diff(self, old, new):
+        # compares the path to old with the path to new (neither including the node itself)
+        # returns (removed, added) -> tiles only on the path to old, and tiles only on the path to new
+        #   - only the part of the paths after the point where they split is walked
+        removed = []
+        added = []
+        
+        a = self.parent[self.index(old)]
+        b = self.parent[self.index(new)]
+        
+        while a != b:
+            # always walk back the deeper of the two, so both reach the split point at the same time
+            if (self.depth[a] if a != -1 else -1) >= (self.depth[b] if b != -1 else -1):
+                removed.append(self.toTile(a))
+                a = self.parent[a]
+            else:
+                added.append(self.toTile(b))
+                b = self.parent[b]
+                
+        return (removed, added)
+
+class JumpParents(Parents):
+    # parent table of searches that jump (like jump point search), where a node can be reached from a tile
+    # any number of tiles away in a straight line
+    #   - only the jump points are stored, the tiles in between are filled in when a path is asked for
+    
+    def between(self, a, b):
+        # tiles strictly between the tiles a and b, which are in the same row or column, going from a to b
+        ax, ay = a
+        bx, by = b
+        dx = (bx > ax) - (bx < ax)
+        dy = (by > ay) - (by < ay)
+        
+        tiles = []
+        
+        x, y = ax + dx, ay + dy
+        while (x, y) != (bx, by):
+            tiles.append((x, y))
+            x += dx
+            y += dy
+            
+        return tiles
+    
+    def getPath(self, tile):
+        # returns the list of tiles from the root up to (but not including) tile, the tiles between jump points included
+        path = []
+        
+        child = tile[:2]
+        i = self.parent[self.index(tile)]
+        while i != -1:
+            parent = self.toTile(i)
+            
+            path += reversed(self.between(parent, child))
+            path.append(parent)
+            
+            child = parent
+            i = self.parent[i]
+            
+        path.reverse()
+        return path
+    
+    def diff(self, old, new):
+        # same as Parents.diff, the tiles between jump points included
+        #   - the tiles jumped over are not in the table, so a path to a jump point can cross itself
+        #     (it can go over a tile that is later reached as a jump point by a longer path)
+        #     and walking back to where the paths split is not enough, both paths are compared as a whole
+        oldPath = self.getPath(old)
+        newPath = self.getPath(new)
+        
+        oldTiles = set(oldPath)
+        newTiles = set(newPath)
+        
+        removed = [tile for tile in oldPath if tile not in newTiles]
+        added = [tile for tile in newPath if tile not in oldTiles]
+        
+        # old is drawn as seen when it stops being the current tile, even if the new path goes through it
+        if old[:2] in newTiles:
+            added.append(old[:2])
+                
+        return (removed, added)
@@ -0,0 +1,54 @@
+from util.Board import Board, ORIGIN, TARGET
+from util.Trace import Replay
+
+# several algorithms solving the same map at the same time, each one in its own process, replayed side by side
+#   - every algorithm is solved and recorded by a worker (see solveTraced in solve.py), so solving all of them
+#     takes as long as the slowest one
+#   - once every trace is back they are replayed in step, each one on its own board
+
+class Pane:
+    def __init__(self, label, future, walls, width, height, origin, target, key = None):
+        self.label = label
+        self.future = future # future of (solution, trace)
+        self.key = key # key of the result in the solution cache (see util/SolutionCache)
+
+        # board with the same map that only shows this algorithm
+        self.board = Board(width, height)
+        self.board.setWalls(walls, [])
+        self.board.set(*origin, ORIGIN)
+        self.board.set(*target, TARGET)
+
+        self.solution = None
+        self.replay = None
+
+class Race:
+    def __init__(self, panes):
+        self.panes = panes
+        self.position = 0 # steps played, the same for every pane
+
+    def ready(self):
+        # true once every worker is done, their results are taken as they finish
+        for pane in self.panes:
+            if pane.replay == None and pane.future.done():
+                pane.solution, trace = pane.future.result()
+                pane.replay = Replay(trace)
+                pane.board.allDirty = True # the pane is drawn again once its result is in
+
+        return all(pane.replay != None for pane in self.panes)
+
+    def seek(self, position):
+        # moves every replay to position (or to its end if it is shorter)
+        self.position = min(max(position, 0), self.steps())
+
+        for pane in self.panes:
+            pane.board.applyChanges(*pane.replay.seek(self.position))
+
+    def steps(self):
+        return max(pane.replay.trace.steps for pane in self.panes)
+
+    def finished(self):
+        return self.position >= self.steps()
+
+    def cancel(self):
+        for pane in self.panes:
+            pane.future.cancel()
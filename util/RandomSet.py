@@ -0,0 +1,59 @@
+import random
+
+# set that can also give a random item in constant time
+#   - items are kept in a list, and a dict remembers where each one is in the list
+#   - removing moves the last item into the hole, so nothing has to be shifted
+
+class RandomSet:
+    def __init__(self, items = ()):
+        self.items = []
+        self.positions = {}
+
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, item):
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item):
+        # raises KeyError if item is not in the set, like set.remove
+        i = self.positions.pop(item)
+        last = self.items.pop()
+
+        if i < len(self.items):
+            self.items[i] = last
+            self.positions[last] = i
+
+    def discard(self, item):
+        if item in self.positions:
+            self.remove(item)
+
+    def choice(self, rand = random):
+        # random item, without removing it
+        return self.items[int(rand.random() * len(self.items))]
+
+    def pop(self, rand = random):
+        # removes and returns a random item, the same as choice and remove without looking the item up again
+        items = self.items
+        i = int(rand.random() * len(items))
+
+        item = items[i]
+        last = items.pop()
+        del self.positions[item]
+
+        if i < len(items):
+            items[i] = last
+            self.positions[last] = i
+
+        return item
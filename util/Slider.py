@@ -0,0 +1,43 @@
+import pygame
+
+class Slider:
+    def __init__(self, x, y, width, text, font, colorPalette, value = 0):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.font = font
+        self.colorPalette = colorPalette
+        
+        self.value = value # between 0 (left) and 1 (right)
+        
+        self.knobR = 8
+        self.lineW = 4
+        
+        # the label is drawn to the left of the track
+        self.setText(text)
+        self.trackY = self.y + self.font.size(text)[1] // 2
+        
+        # clickable area, a bit bigger than the track so it's easy to grab
+        self.rect = pygame.Rect(
+            self.x - self.knobR, 
+            self.trackY - self.knobR * 2, 
+            self.width + self.knobR * 2, 
+            self.knobR * 4
+            )
+        
+    def draw(self, screen):
+        screen.blit(self.renderedText, (self.x - self.font.size(self.text)[0] - self.knobR * 3, self.y))
+        
+        pygame.draw.line(screen, self.colorPalette["DARKBLUE"], (self.x, self.trackY), (self.x + self.width, self.trackY), self.lineW)
+        pygame.draw.circle(screen, self.colorPalette["BLUE"], (self.x + round(self.value * self.width), self.trackY), self.knobR)
+    
+    def clicked(self, x, y):
+        return self.rect.collidepoint(x, y)
+    
+    def moveTo(self, x):
+        # moves the knob to the x coordinate of the mouse
+        self.value = min(max((x - self.x) / self.width, 0), 1)
+        
+    def setText(self, text):
+        self.text = text
+        self.renderedText = self.font.render(self.text, True, self.colorPalette["DARKBLUE"])
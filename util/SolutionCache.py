@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+# finished searches, so solving the same map again with the same algorithm only plays back the result
+#   - keys are (map key, origin, target, algorithm), see Board.mapKey
+#   - values are (solution, trace), see solve.py and util/Trace
+#   - the least recently used entries are dropped once there are more than maxEntries or they take more than maxBytes
+
+class SolutionCache:
+    def __init__(self, maxEntries = 32, maxBytes = 256 * 1024 * 1024):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+        # how many lookups found something and how many didn't
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        # returns (solution, trace) or None
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, solution, trace):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+
+        # a trace bigger than the whole cache would only push everything else out
+        size = trace.nbytes()
+        if size > self.maxBytes:
+            return
+
+        self.entries[key] = (solution, trace)
+        self.nbytes += size
+
+        while len(self.entries) > self.maxEntries or self.nbytes > self.maxBytes:
+            _, (_, oldest) = self.entries.popitem(last = False)
+            self.nbytes -= oldest.nbytes()
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
@@ -0,0 +1,140 @@
+# maze generator that builds the maze one row at a time, for boards too big to keep in memory
+# following Eller's algorithm:
+# http://www.neocomputer.org/projects/eller.html
+
+# steps:
+#     1. Like in Maze, cells are the tiles in even rows and even columns, everything else starts as a wall
+#     2. Every cell of the current row belongs to a set, cells in the same set are already connected
+#     3. At random, remove the walls between neighboring cells of different sets, joining their sets
+#     4. For every set, remove the wall below at least one of its cells, those cells keep their set in the next row
+#     5. The cells of the next row that were not reached from above start a set of their own, repeat from 3.
+#     6. In the last row join every neighboring cells of different sets, so everything is connected
+#
+# only the sets of the current row are kept, so memory depends on the width and not on the height
+# the result is a perfect maze -> there is exactly one path between any two cells
+
+import random
+
+from util.MapFile import saveBinary
+
+class StreamMaze():
+    def __init__(self, width, height, seed = None):
+        self.width = width
+        self.height = height
+
+        # the same seed always generates the same maze, None picks a different one every time
+        self.seed = seed
+
+        self.cellWidth = (width + 1) // 2
+        self.cellHeight = (height + 1) // 2
+
+    def rows(self):
+        # yields the rows of the maze from top to bottom, each one as a bytearray where 1 is a wall and 0 a tile
+        #   - a new generator starts the same maze again from the top
+        rand = random.Random(self.seed)
+
+        W = self.width
+        cellRow = bytes(w % 2 for w in range(W))
+
+        # sets[c] is the set of the cell in column c of the current row, 0 if it doesn't have one yet
+        sets = [0] * self.cellWidth
+        members = {} # set -> columns of the cells in it
+        nextSet = 1
+
+        y = 0
+        for r in range(self.cellHeight):
+            last = r == self.cellHeight - 1
+
+            # step 5
+            for c in range(self.cellWidth):
+                if sets[c] == 0:
+                    sets[c] = nextSet
+                    members[nextSet] = [c]
+                    nextSet += 1
+
+            # step 3 and 6
+            row = bytearray(cellRow)
+
+            for c in range(self.cellWidth - 1):
+                if sets[c] != sets[c + 1] and (last or rand.random() < 0.5):
+                    row[2 * c + 1] = 0
+                    self.join(sets, members, sets[c], sets[c + 1])
+
+            yield self.fixOddWalls(row, y)
+            y += 1
+
+            if y == self.height:
+                break
+
+            # step 4
+            row = bytearray([1]) * W
+
+            if not last:
+                below = {}
+
+                for s, columns in members.items():
+                    down = [c for c in columns if rand.random() < 0.5]
+                    if not down:
+                        down = [columns[int(rand.random() * len(columns))]]
+
+                    below[s] = down
+
+                    for c in down:
+                        row[2 * c] = 0
+
+                # the cells that were not reached from above start without a set
+                sets = [0] * self.cellWidth
+                for s, down in below.items():
+                    for c in down:
+                        sets[c] = s
+
+                members = below
+
+            else:
+                # the height is even, so there is a row of walls left at the bottom
+                for w in range(0, W, 4):
+                    row[w] = 0
+
+            yield self.fixOddWalls(row, y)
+            y += 1
+
+    def join(self, sets, members, a, b):
+        # moves the cells of the smaller set into the bigger one
+        if len(members[a]) < len(members[b]):
+            a, b = b, a
+
+        for c in members[b]:
+            sets[c] = a
+
+        members[a] += members.pop(b)
+
+    def fixOddWalls(self, row, y):
+        # when the width is even the last column is all walls, so some tiles are opened like Maze does
+        if self.width % 2 == 0 and y % 4 == 0:
+            row[self.width - 1] = 0
+
+        return row
+
+    def write(self, buffer):
+        # writes the maze into a writable bytes-like object of width * height bytes (like a bytearray or an mmap)
+        # one row at a time, the row y goes at y * width
+        view = memoryview(buffer)
+
+        if view.nbytes < self.width * self.height:
+            raise ValueError("the buffer is smaller than the maze")
+
+        view = view.cast("B")
+
+        W = self.width
+        for y, row in enumerate(self.rows()):
+            view[y * W:(y + 1) * W] = row
+
+    def save(self, path, origin = (0, 0), target = None):
+        # writes the maze to a binary map (.gtm, see util/MapFile) that solve.py and the visualizer can open
+        #   - the rows are written as they are generated, so the maze never has to be all in memory
+        #   - target is the cell in the opposite corner by default
+        if target == None:
+            target = ((self.width - 1) // 2 * 2, (self.height - 1) // 2 * 2)
+
+        saveBinary(path, self.rows(), self.width, self.height, origin, target, self.seed)
+
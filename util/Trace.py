@@ -0,0 +1,215 @@
+from util.Parents import Parents, JumpParents
+
+from array import array
+import struct
+import sys
+
+# a search solved once up front and stored as a compact list of events, so it can be replayed at any speed,
+# moved backwards and forwards, and saved to a file without running the search again
+#
+#   - every event is an int32 -> index * 4 + event code
+#   - every step starts with a CURRENT event (with the index of the current node in the parent table)
+#     followed by a SEEN event for each tile seen in that step (with the tile index)
+#   - keyframes store where every KEYFRAME-th step starts, so finding a step only scans up to KEYFRAME steps
+#   - the final parent table of the search is kept to rebuild the path to the current tile of any step
+
+# event codes
+CURRENT = 0
+SEEN = 1
+
+KEYFRAME = 256
+
+MAGIC = b"GTTR"
+VERSION = 3
+HEADER = struct.Struct("<4sHIIIIiIIIIII") # magic, version, width, height, start, target, status, steps, keyframe, events, layers, jumps, name
+
+class Trace:
+    def __init__(self, width, height, start, target, walls, algorithm = "", layers = 1, jumps = False):
+        self.width = width
+        self.height = height
+        self.start = start
+        self.target = target
+        self.walls = bytes(walls) # flat, 1 for walls and 0 for tiles
+        self.algorithm = algorithm
+
+        self.events = array('i')
+        self.keyframes = array('i')
+        self.steps = 0
+        self.status = 0 # what the last step of the search returned
+
+        # searches that jump store only the jump points, see util/Parents
+        self.parents = (JumpParents if jumps else Parents)(width, height, layers)
+
+    @classmethod
+    def record(cls, search, walls, algorithm = ""):
+        # runs search to the end, recording every step
+        #   - walls is the flat map the search was given (see Board.getWalls)
+        trace = cls.begin(search, walls, algorithm)
+        status = 0
+
+        while status == 0:
+            status = search.stepSearch()
+
+            # nothing was taken out of the frontier
+            if status == -1:
+                break
+
+            trace.recordStep(search)
+
+        trace.finish(search, status)
+
+        return trace
+
+    @classmethod
+    def begin(cls, search, walls, algorithm = ""):
+        # empty trace for search, its steps are added with recordStep as they are made
+        return cls(search.parents.width, search.parents.height, search.start, search.target, walls, algorithm,
+                   search.parents.layers, isinstance(search.parents, JumpParents))
+
+    def recordStep(self, search):
+        # adds the step search just made (when stepSearch didn't return -1), returns the tiles it saw
+        #   -> they are taken from the changes of the search (see util/Changes), so they have to be drawn from here
+        events = self.events
+
+        if self.steps % KEYFRAME == 0:
+            self.keyframes.append(len(events))
+
+        events.append(search.parents.index(search.current) * 4 + CURRENT)
+
+        seen = search.changes.takeSeen()
+        width = self.width
+        for x, y in seen:
+            events.append((y * width + x) * 4 + SEEN)
+
+        self.steps += 1
+
+        return seen
+
+    def finish(self, search, status):
+        # what the last step returned, and the parent table to rebuild the paths
+        self.status = status
+        self.parents = search.parents
+
+    def nbytes(self):
+        # memory taken by the trace
+        arrays = (self.events, self.keyframes, self.parents.parent, self.parents.depth)
+        return len(self.walls) + sum(len(values) * values.itemsize for values in arrays)
+
+    def stepStart(self, step):
+        # index of the event where step starts (len(events) for the step after the last one)
+        if step >= self.steps:
+            return len(self.events)
+
+        i = self.keyframes[step // KEYFRAME]
+
+        # skip the steps between the keyframe and step
+        for _ in range(step % KEYFRAME):
+            i += 1
+            while self.events[i] & 3 != CURRENT:
+                i += 1
+
+        return i
+
+    def currentAt(self, position):
+        # current node after position steps
+        if position == 0:
+            return self.start
+
+        return self.parents.toNode(self.events[self.stepStart(position - 1)] >> 2)
+
+    def toTile(self, index):
+        return (index % self.width, index // self.width)
+
+    def getPath(self):
+        # path from start to target (both included), empty if the target was not found
+        if self.status != 1:
+            return []
+
+        return self.parents.getPath(self.currentAt(self.steps)) + [self.target]
+
+    def save(self, path):
+        name = self.algorithm.encode()
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(
+                MAGIC, VERSION, self.width, self.height,
+                self.start[1] * self.width + self.start[0], self.target[1] * self.width + self.target[0],
+                self.status, self.steps, KEYFRAME, len(self.events), self.parents.layers,
+                isinstance(self.parents, JumpParents), len(name)
+                ))
+            file.write(name)
+            file.write(self.walls)
+
+            for values in (self.events, self.keyframes, self.parents.parent, self.parents.depth):
+                file.write(littleEndian(values).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, version, width, height, start, target, status, steps, keyframe, nEvents, layers, jumps, nName = HEADER.unpack_from(data)
+
+        if magic != MAGIC or version != VERSION or keyframe != KEYFRAME:
+            raise ValueError(path + " is not a trace file this version can read")
+
+        i = HEADER.size
+        algorithm = data[i:i + nName].decode()
+        i += nName
+
+        walls = data[i:i + width * height]
+        i += width * height
+
+        trace = cls(width, height, (start % width, start // width), (target % width, target // width), walls, algorithm, layers, jumps)
+        trace.status = status
+        trace.steps = steps
+
+        nKeyframes = (steps + KEYFRAME - 1) // KEYFRAME
+        for values, n in ((trace.events, nEvents), (trace.keyframes, nKeyframes),
+                          (trace.parents.parent, width * height * layers), (trace.parents.depth, width * height * layers)):
+            del values[:]
+            values.frombytes(data[i:i + n * 4])
+            if sys.byteorder == "big":
+                values.byteswap()
+            i += n * 4
+
+        return trace
+
+def littleEndian(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values
+
+class Replay:
+    # plays a trace, reporting the changes between two positions the same way the algorithms do (see util/Changes)
+    def __init__(self, trace):
+        self.trace = trace
+        self.position = 0 # number of steps that have been played
+
+    def finished(self):
+        return self.position >= self.trace.steps
+
+    def seek(self, position):
+        # moves to position, returns (seen, previous, current, removed, added, unseen)
+        #   - unseen are the tiles that were seen after position when moving backwards
+        trace = self.trace
+        position = min(max(position, 0), trace.steps)
+
+        a = trace.stepStart(self.position)
+        b = trace.stepStart(position)
+
+        tiles = [trace.toTile(event >> 2) for event in trace.events[min(a, b):max(a, b)] if event & 3 == SEEN]
+
+        seen = tiles if b > a else []
+        unseen = tiles if b < a else []
+
+        previous = trace.currentAt(self.position)
+        current = trace.currentAt(position)
+
+        removed, added = trace.parents.diff(previous, current)
+
+        self.position = position
+
+        return (seen, previous[:2], current[:2], removed, added, unseen)
@@ -0,0 +1,40 @@
+# set of the tiles of a board, kept as one byte per tile instead of a set of tuples
+#   - flags[y * width + x] is 1 if (x, y) is in the set, 0 if it is not
+#   - it takes width * height bytes no matter how many tiles are in it, a set of tuples takes 100+ bytes per tile
+#   - searches that work with cell ids (see util/Adjacency) can read and write flags directly in their loops
+#
+# it behaves like the set of (x, y) tuples it replaces -> add, in, len and iterating over the tiles
+
+class Visited:
+    def __init__(self, width, height, tiles = ()):
+        self.width = width
+        self.height = height
+
+        self.flags = bytearray(width * height)
+
+        for tile in tiles:
+            self.add(tile)
+
+    def __contains__(self, tile):
+        x, y = tile
+        return self.flags[y * self.width + x] == 1
+
+    def __len__(self):
+        return self.flags.count(1)
+
+    def __iter__(self):
+        # tiles in the order of their cell ids, from the top left to the bottom right
+        W = self.width
+        flags = self.flags
+
+        i = flags.find(1)
+        while i != -1:
+            yield (i % W, i // W)
+            i = flags.find(1, i + 1)
+
+    def add(self, tile):
+        x, y = tile
+        self.flags[y * self.width + x] = 1
+
+    def addIndex(self, i):
+        self.flags[i] = 1